@@ -1,11 +1,11 @@
 import sqlite3
 import os
-import opfunu.cec_based
 
 from Problem.SCP.problem import obtenerOptimo
 from Problem.USCP.problem import obtenerOptimoUSCP
 from Problem.USCP.problem import obtenerOptimoUSCP
 from Problem.KP.problem import obtenerOptimoKP
+from Problem.Benchmark.registry import FUNCIONES_BEN, FUNCIONES_CEC, obtenerBenchmark
 
 class BD:
     def __init__(self):
@@ -85,6 +85,8 @@ class BD:
             )'''
         )
 
+        self.crearTablaEstadisticas()
+
         self.getCursor().execute(
             ''' CREATE TABLE IF NOT EXISTS iteraciones(
                 id_archivo INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -126,137 +128,21 @@ class BD:
         self.commit()
         self.desconectar()
         
-    data = ['F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12', 'F13', 'F14', 'F15', 'F16', 'F17', 'F18', 'F19', 'F20', 'F21', 'F22', 'F23']
+    data = list(FUNCIONES_BEN)
 
-    opfunu_cec_data = [
-        'F32005', 'F72005', 'F122005', 'F132005', 'F172005', 'F232005',  #Funciones del CEC 2005
-        'F22008', 'F32008', 'F52008', 'F62008', 'F42008', 'F72008',      #Funciones del CEC 2008
-        'F12010', 'F42010', 'F102010', 'F162010', 'F132010', 'F172010',  #Funciones del CEC 2010
-        'F32013', 'F52013', 'F72013', 'F262013', 'F132013', 'F242013',   #Funciones del CEC 2013
-        'F12014', 'F32014', 'F62014', 'F162014', 'F242014', 'F292014',   #Funciones del CEC 2014
-        'F12015', 'F22015', 'F62015', 'F72015', 'F102015', 'F112015',    #Funciones del CEC 2015
-        'F12017', 'F22017', 'F242017', 'F272017', 'F192017', 'F292017',  #Funciones del CEC 2017
-        'F42019', 'F52019', 'F92019', 'F12019', 'F22019', 'F32019',      #Funciones del CEC 2019
-        'F12020', 'F42020', 'F32020', 'F102020', 'F72020', 'F92020',     #Funciones del CEC 2020
-        'F12021', 'F42021', 'F22021', 'F102021', 'F52021', 'F62021',     #Funciones del CEC 2021
-        'F12022', 'F22022', 'F92022', 'F122022', 'F82022', 'F112022'     #Funciones del CEC 2022
-        ]
+    opfunu_cec_data = FUNCIONES_CEC
 
     def insertarInstanciasBEN(self):
         self.conectar()
 
         tipoProblema = 'BEN'
         
-        def opfunu_cec_parametros(instancia):
-            func_class = getattr(opfunu.cec_based, f"{instancia}")
-            return func_class()
-        
-        for instancia in self.data:
-            param = ''
-            
-            if instancia == 'F1':
-                param     = f'lb:-100,ub:100'
-                optimo = 0
-            
-            if instancia == 'F2':
-                param     = f'lb:-10,ub:10'
-                optimo = 0
-                
-            if instancia == 'F3':
-                param     = f'lb:-100,ub:100'
-                optimo = 0
-                
-            if instancia == 'F4':
-                param     = f'lb:-100,ub:100'
-                optimo = 0
-                
-            if instancia == 'F5':
-                param     = f'lb:-30,ub:30'
-                optimo = 0
-                
-            if instancia == 'F6':
-                param     = f'lb:-100,ub:100'
-                optimo = 0
-                
-            if instancia == 'F7':
-                param     = f'lb:-1.28,ub:1.28'
-                optimo = 0
-                
-            if instancia == 'F8':
-                param     = f'lb:-500,ub:500'
-                optimo = -418.9829
-                
-            if instancia == 'F9':
-                param     = f'lb:-5.12,ub:5.12'
-                optimo = 0
-                
-            if instancia == 'F10':
-                param     = f'lb:-32,ub:32'
-                optimo = 0
-                
-            if instancia == 'F11':
-                param     = f'lb:-600,ub:600'
-                optimo = 0
-                
-            if instancia == "F12":
-                param     = f'lb:-50,ub:50'
-                optimo = 0
-                
-            if instancia == "F13":
-                param     = f'lb:-50,ub:50'
-                optimo = 0
-                
-            if instancia == "F14":
-                param     = f'lb:-65.536,ub:65.536'
-                optimo = 1
-                
-            if instancia == "F15":
-                param     = f'lb:-5,ub:5'
-                optimo = 0.00030
-                
-            if instancia == "F16":
-                param     = f'lb:-5,ub:5'
-                optimo = -1.0316
-                
-            if instancia == "F17":
-                param     = f'lb:-5,ub:5'
-                optimo = 0.398
-                
-            if instancia == "F18":
-                param     = f'lb:-2,ub:2'
-                optimo = 3
-                
-            if instancia == "F19":
-                param     = f'lb:0,ub:1'
-                optimo = -3.86
-                
-            if instancia == "F20":
-                param     = f'lb:0,ub:1'
-                optimo = -3.32
-                   
-            if instancia == "F21":
-                param     = f'lb:0,ub:10'
-                optimo = -10.1532
-                
-            if instancia == "F22":
-                param     = f'lb:0,ub:10'
-                optimo = -10.4028
-                
-            if instancia == "F23":
-                param     = f'lb:0,ub:10'
-                optimo = -10.5363
-
-            if param == '':
-                raise ValueError(f"Advertencia: La función '{instancia}' no está definida.")
+        # Límites y óptimos vienen del registro de benchmarks
+        for instancia in self.data + self.opfunu_cec_data:
+            benchmark = obtenerBenchmark(instancia)
+            param = f'lb:{benchmark.getLb()},ub:{benchmark.getUb()}'
 
-            self.getCursor().execute(f'''  INSERT INTO instancias (tipo_problema, nombre, optimo, param) VALUES(?, ?, ?, ?) ''', (tipoProblema, instancia, optimo, param))
-
-        for instancia in self.opfunu_cec_data:
-            
-            param = f'lb:{opfunu_cec_parametros(instancia).lb[0]},ub:{opfunu_cec_parametros(instancia).ub[0]}'
-            optimo = opfunu_cec_parametros(instancia).f_global
-
-            self.getCursor().execute(f'''  INSERT INTO instancias (tipo_problema, nombre, optimo, param) VALUES(?, ?, ?, ?) ''', (tipoProblema, instancia, optimo, param))
+            self.getCursor().execute(f'''  INSERT INTO instancias (tipo_problema, nombre, optimo, param) VALUES(?, ?, ?, ?) ''', (tipoProblema, instancia, benchmark.getOptimo(), param))
         
         self.commit()
         self.desconectar()
@@ -393,6 +279,32 @@ class BD:
         self.commit()
         self.desconectar()
         
+    def crearTablaEstadisticas(self):
+        # Estadísticas de cada ejecución (reducción de la instancia, cachés, etc.) como pares clave/valor
+        self.getCursor().execute(
+            ''' CREATE TABLE IF NOT EXISTS estadisticas(
+                id_estadistica INTEGER PRIMARY KEY AUTOINCREMENT,
+                clave TEXT,
+                valor REAL,
+                fk_id_experimento INTEGER,
+                FOREIGN KEY (fk_id_experimento) REFERENCES experimentos (id_experimento)
+            )'''
+        )
+
+    def insertarEstadisticas(self, estadisticas, id):
+        self.conectar()
+        
+        cursor = self.getCursor()
+        
+        # Las bases de datos creadas antes de esta tabla la crean al primer uso
+        self.crearTablaEstadisticas()
+        
+        cursor.executemany(''' INSERT INTO estadisticas (clave, valor, fk_id_experimento) VALUES(?, ?, ?) ''',
+                           [(clave, float(valor), id) for clave, valor in estadisticas.items()])
+        
+        self.commit()
+        self.desconectar()
+        
     def obtenerArchivos(self, instancia, incluir_binarizacion=True):
         self.conectar()
         cursor = self.getCursor()
@@ -729,6 +641,7 @@ class BD:
         self.getCursor().execute(''' DROP TABLE experimentos ''')
         self.getCursor().execute(''' DROP TABLE resultados ''')
         self.getCursor().execute(''' DROP TABLE iteraciones ''')
+        self.getCursor().execute(''' DROP TABLE IF EXISTS estadisticas ''')
         
         self.construirTablas()
         
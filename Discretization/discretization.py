@@ -78,7 +78,7 @@ def aplicarBinarizacion(ind, ds, bestSolutionBin, indBin):
         indBin (np.ndarray): Representación binaria actual del individuo.
 
     Returns:
-        np.ndarray: Representación binaria transformada del individuo.
+        np.ndarray: Representación binaria transformada del individuo (uint8).
 
     Raises:
         ValueError: Si ocurre un error en la función de transferencia o binarización.
@@ -101,7 +101,8 @@ def aplicarBinarizacion(ind, ds, bestSolutionBin, indBin):
     except Exception as e:
         raise ValueError(f"Error en la función de binarización '{binarizationFunction}': {e}")
 
-    return individuoBin
+    # Las soluciones binarias se manejan en uint8 (reparación, evaluación y empaquetado)
+    return np.asarray(individuoBin, dtype = np.uint8)
 
 # === Funciones de Binarización ===
 '''def gvp_binarization(continuous_values):
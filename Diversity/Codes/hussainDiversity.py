@@ -1,4 +1,21 @@
+from Problem.packed import PackedPopulation
+
+def diversidadHussainEmpaquetada(poblacion):
+    # Con variables binarias sum_i |m_d - x_id| = c_d (1 - m_d) + (n - c_d) m_d, donde c_d es la
+    # cantidad de unos de la variable d y m_d = c_d / n, por lo que bastan las sumas por columna
+    n = len(poblacion)
+    l = poblacion.getDimension()
+    unos = poblacion.columnSums()
+    medianas = unos / n
+
+    diversidad = (unos * (1 - medianas) + (n - unos) * medianas).sum()
+
+    return round(((1 / (l * n)) * diversidad), 3)
+
 def diversidadHussain(matriz):
+    if isinstance(matriz, PackedPopulation):
+        return diversidadHussainEmpaquetada(matriz)
+    
     medianas = []
     
     for j in range(matriz[0].__len__()):
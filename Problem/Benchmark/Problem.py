@@ -1,38 +1,20 @@
 import numpy as np 
 import math
-import opfunu.cec_based
 
-from BD.sqlite import BD
+from Problem.Benchmark.registry import obtenerBenchmark
 
 def fitness(problem, individual):
     """
     Evalúa la función de fitness para un individuo o una población.
-    """
-    # Asegurarnos de que estamos trabajando con un individuo
-    if isinstance(individual, np.ndarray) and len(individual.shape) == 2:
-        raise ValueError("La función 'fitness' solo admite un individuo, no una población completa. Asegúrate de aplicar correctamente.")
-    
-    fitness_value = 0
-
-    def opfunu_cec_function(x):
-        func_class = getattr(opfunu.cec_based, f"{problem}")
-        return func_class().evaluate(x)
 
+    Con una matriz (N, D) (un individuo por fila) devuelve los N valores: F1-F23 usan sus
+    versiones por población (F*_batch) y las CEC recorren las filas con el objeto en caché.
+    """
     # Asegurar que `problem` sea un string válido
-    if isinstance(problem, str):
-        if problem in BD.data:
-            try:
-                fitness_value = globals()[problem](individual)
-            except KeyError:
-                raise ValueError(f"La función '{problem}' no está definida en el contexto global.")
-        elif problem in BD.opfunu_cec_data:
-            fitness_value = opfunu_cec_function(individual)
-        else:
-            raise ValueError(f"El problema '{problem}' no es reconocido.")
-    else:
+    if not isinstance(problem, str):
         raise TypeError("El parámetro 'problem' debe ser un string que identifique la función objetivo.")
 
-    return fitness_value
+    return obtenerBenchmark(problem).evaluar(individual)
 
 # define the function blocks
 def prod(it):
@@ -385,4 +367,154 @@ def F23(L): #Shekel’s Function (Variant No. 10)
         
     o = fit.item(0)
     
-    return o
\ No newline at end of file
+    return o
+
+# Versiones por población de F1-F23: reciben una matriz (N, D), un individuo por fila, y
+# devuelven los N valores de fitness con operaciones sobre ejes en lugar de bucles de Python.
+
+A_FOXHOLES = np.array([[-32, -16, 0, 16, 32] * 5, np.repeat([-32, -16, 0, 16, 32], 5)])
+# Mismos pesos que F14 (la última posición queda en 24)
+W_FOXHOLES = np.array(list(range(1, 25)) + [24])
+
+A_KOWALIK = np.array([0.1957, 0.1947, 0.1735, 0.16, 0.0844, 0.0627, 0.0456, 0.0342, 0.0323, 0.0235, 0.0246])
+B_KOWALIK = 1 / np.array([0.25, 0.5, 1, 2, 4, 6, 8, 10, 12, 14, 16])
+
+C_HARTMAN = np.array([1, 1.2, 3, 3.2])
+A_HARTMAN_3 = np.array([[3, 10, 30], [0.1, 10, 35], [3, 10, 30], [0.1, 10, 35]])
+P_HARTMAN_3 = np.array([
+    [0.3689, 0.117, 0.2673],
+    [0.4699, 0.4387, 0.747],
+    [0.1091, 0.8732, 0.5547],
+    [0.03815, 0.5743, 0.8828],
+])
+A_HARTMAN_6 = np.array([
+    [10, 3, 17, 3.5, 1.7, 8],
+    [0.05, 10, 17, 0.1, 8, 14],
+    [3, 3.5, 1.7, 10, 17, 8],
+    [17, 8, 0.05, 10, 0.1, 14],
+])
+P_HARTMAN_6 = np.array([
+    [0.1312, 0.1696, 0.5569, 0.0124, 0.8283, 0.5886],
+    [0.2329, 0.4135, 0.8307, 0.3736, 0.1004, 0.9991],
+    [0.2348, 0.1415, 0.3522, 0.2883, 0.3047, 0.6650],
+    [0.4047, 0.8828, 0.8732, 0.5743, 0.1091, 0.0381],
+])
+
+A_SHEKEL = np.array([
+    [4, 4, 4, 4], [1, 1, 1, 1], [8, 8, 8, 8], [6, 6, 6, 6], [3, 7, 3, 7],
+    [2, 9, 2, 9], [5, 5, 3, 3], [8, 1, 8, 1], [6, 2, 6, 2], [7, 3.6, 7, 3.6],
+])
+C_SHEKEL = np.array([0.1, 0.2, 0.2, 0.4, 0.4, 0.6, 0.3, 0.7, 0.5, 0.5])
+
+def F1_batch(X):
+    return np.sum(X ** 2, axis = 1)
+
+def F2_batch(X):
+    return np.sum(np.abs(X), axis = 1) + np.prod(np.abs(X), axis = 1)
+
+def F3_batch(X):
+    # Suma de los cuadrados de las sumas parciales
+    return np.sum(np.cumsum(X, axis = 1) ** 2, axis = 1)
+
+def F4_batch(X):
+    return np.max(np.abs(X), axis = 1)
+
+def F5_batch(X):
+    return np.sum(100 * (X[:, 1:] - X[:, :-1] ** 2) ** 2 + (X[:, :-1] - 1) ** 2, axis = 1)
+
+def F6_batch(X):
+    return np.sum(np.abs(X + 0.5) ** 2, axis = 1)
+
+def F7_batch(X):
+    w = np.arange(1, X.shape[1] + 1)
+
+    return np.sum(w * (X ** 4), axis = 1) + np.random.uniform(0, 1, X.shape[0])
+
+def F8_batch(X):
+    return np.sum(-X * np.sin(np.sqrt(np.abs(X))), axis = 1)
+
+def F9_batch(X):
+    return np.sum(X ** 2 - 10 * np.cos(2 * math.pi * X), axis = 1) + 10 * X.shape[1]
+
+def F10_batch(X):
+    dim = X.shape[1]
+
+    return (
+        -20 * np.exp(-0.2 * np.sqrt(np.sum(X ** 2, axis = 1) / dim))
+        - np.exp(np.sum(np.cos(2 * math.pi * X), axis = 1) / dim)
+        + 20
+        + np.exp(1)
+    )
+
+def F11_batch(X):
+    w = np.arange(1, X.shape[1] + 1)
+
+    return np.sum(X ** 2, axis = 1) / 4000 - np.prod(np.cos(X / np.sqrt(w)), axis = 1) + 1
+
+def F12_batch(X):
+    dim = X.shape[1]
+
+    return (math.pi / dim) * (
+        10 * (np.sin(math.pi * (1 + (X[:, 0] + 1) / 4))) ** 2
+        + np.sum(
+            (((X[:, :-1] + 1) / 4) ** 2)
+            * (1 + 10 * (np.sin(math.pi * (1 + (X[:, 1:] + 1) / 4))) ** 2), axis = 1
+        )
+        + ((X[:, -1] + 1) / 4) ** 2
+    ) + np.sum(Ufun(X, 10, 100, 4), axis = 1)
+
+def F13_batch(X):
+    return 0.1 * (
+        (np.sin(3 * np.pi * X[:, 0])) ** 2
+        + np.sum((X[:, :-1] - 1) ** 2 * (1 + (np.sin(3 * np.pi * X[:, 1:])) ** 2), axis = 1)
+        + ((X[:, -1] - 1) ** 2) * (1 + (np.sin(2 * np.pi * X[:, -1])) ** 2)
+    ) + np.sum(Ufun(X, 5, 100, 4), axis = 1)
+
+def F14_batch(X):
+    # Distancia de cada individuo a los 25 agujeros: (N, 2, 1) - (2, 25)
+    bS = np.sum((X[:, :, np.newaxis] - A_FOXHOLES) ** 6, axis = 1)
+
+    return ((1.0 / 500) + np.sum(1.0 / (W_FOXHOLES + bS), axis = 1)) ** (-1)
+
+def F15_batch(X):
+    L = X[:, :4, np.newaxis]
+    bK = B_KOWALIK
+
+    return np.sum(
+        (A_KOWALIK - ((L[:, 0] * (bK ** 2 + L[:, 1] * bK)) / (bK ** 2 + L[:, 2] * bK + L[:, 3]))) ** 2, axis = 1
+    )
+
+def F16_batch(X):
+    return F16(X.T)
+
+def F17_batch(X):
+    return F17(X.T)
+
+def F18_batch(X):
+    return F18(X.T)
+
+def hartman_batch(X, aH, pH):
+    # (N, 1, D) - (4, D): un término por cada uno de los 4 centros
+    distancia = np.sum(aH * (X[:, np.newaxis, :] - pH) ** 2, axis = 2)
+
+    return -(np.exp(-distancia) @ C_HARTMAN)
+
+def F19_batch(X):
+    return hartman_batch(X, A_HARTMAN_3, P_HARTMAN_3)
+
+def F20_batch(X):
+    return hartman_batch(X, A_HARTMAN_6, P_HARTMAN_6)
+
+def shekel_batch(X, m):
+    distancia = np.sum((X[:, np.newaxis, :] - A_SHEKEL[:m]) ** 2, axis = 2)
+
+    return -np.sum(1 / (distancia + C_SHEKEL[:m]), axis = 1)
+
+def F21_batch(X):
+    return shekel_batch(X, 5)
+
+def F22_batch(X):
+    return shekel_batch(X, 7)
+
+def F23_batch(X):
+    return shekel_batch(X, 10)
@@ -0,0 +1,159 @@
+import numpy as np
+import opfunu.cec_based
+
+# Registro de las funciones benchmark: para cada nombre, la función ya resuelta (individuo y
+# población), sus límites, su óptimo y la dimensión por defecto. Las entradas se resuelven una
+# sola vez, así que evaluar no busca el nombre en listas ni en globals() en cada llamada.
+
+# nombre: (lb, ub, óptimo, dimensión por defecto)
+FUNCIONES_BEN = {
+    'F1': (-100, 100, 0, 30),
+    'F2': (-10, 10, 0, 30),
+    'F3': (-100, 100, 0, 30),
+    'F4': (-100, 100, 0, 30),
+    'F5': (-30, 30, 0, 30),
+    'F6': (-100, 100, 0, 30),
+    'F7': (-1.28, 1.28, 0, 30),
+    'F8': (-500, 500, -418.9829, 30),
+    'F9': (-5.12, 5.12, 0, 30),
+    'F10': (-32, 32, 0, 30),
+    'F11': (-600, 600, 0, 30),
+    'F12': (-50, 50, 0, 30),
+    'F13': (-50, 50, 0, 30),
+    'F14': (-65.536, 65.536, 1, 2),
+    'F15': (-5, 5, 0.00030, 4),
+    'F16': (-5, 5, -1.0316, 2),
+    'F17': (-5, 5, 0.398, 2),
+    'F18': (-2, 2, 3, 2),
+    'F19': (0, 1, -3.86, 3),
+    'F20': (0, 1, -3.32, 6),
+    'F21': (0, 10, -10.1532, 4),
+    'F22': (0, 10, -10.4028, 4),
+    'F23': (0, 10, -10.5363, 4),
+}
+
+FUNCIONES_CEC = [
+    'F32005', 'F72005', 'F122005', 'F132005', 'F172005', 'F232005',  #Funciones del CEC 2005
+    'F22008', 'F32008', 'F52008', 'F62008', 'F42008', 'F72008',      #Funciones del CEC 2008
+    'F12010', 'F42010', 'F102010', 'F162010', 'F132010', 'F172010',  #Funciones del CEC 2010
+    'F32013', 'F52013', 'F72013', 'F262013', 'F132013', 'F242013',   #Funciones del CEC 2013
+    'F12014', 'F32014', 'F62014', 'F162014', 'F242014', 'F292014',   #Funciones del CEC 2014
+    'F12015', 'F22015', 'F62015', 'F72015', 'F102015', 'F112015',    #Funciones del CEC 2015
+    'F12017', 'F22017', 'F242017', 'F272017', 'F192017', 'F292017',  #Funciones del CEC 2017
+    'F42019', 'F52019', 'F92019', 'F12019', 'F22019', 'F32019',      #Funciones del CEC 2019
+    'F12020', 'F42020', 'F32020', 'F102020', 'F72020', 'F92020',     #Funciones del CEC 2020
+    'F12021', 'F42021', 'F22021', 'F102021', 'F52021', 'F62021',     #Funciones del CEC 2021
+    'F12022', 'F22022', 'F92022', 'F122022', 'F82022', 'F112022'     #Funciones del CEC 2022
+    ]
+
+# Objetos de las funciones CEC de opfunu ya construidos, por (función, dimensión). Construir uno
+# carga los datos de desplazamiento y rotación, así que se construye una sola vez por proceso.
+CEC_FUNCIONES = {}
+
+def funcionCEC(problem, dim = None):
+    """
+    Devuelve el objeto opfunu de la función CEC para la dimensión dada, construyéndolo solo
+    la primera vez. Las funciones que no admiten la dimensión se construyen con la suya.
+    """
+    clave = (problem, dim)
+
+    if clave not in CEC_FUNCIONES:
+        func_class = getattr(opfunu.cec_based, f"{problem}")
+
+        try:
+            CEC_FUNCIONES[clave] = func_class() if dim is None else func_class(ndim = dim)
+        except (ValueError, TypeError):
+            CEC_FUNCIONES[clave] = func_class()
+
+    return CEC_FUNCIONES[clave]
+
+def precargarCEC(problems, dim = None):
+    """
+    Construye por adelantado las funciones CEC indicadas (un nombre o una lista), para que el
+    costo de cargar sus datos no caiga en las evaluaciones. Ignora las funciones que no son CEC.
+    """
+    if isinstance(problems, str):
+        problems = [problems]
+
+    for problem in problems:
+        if problem in FUNCIONES_CEC:
+            funcionCEC(problem, dim)
+
+class Benchmark:
+    def __init__(self, nombre, funcion, lote, lb, ub, optimo, dim):
+        self.__nombre = nombre
+        self.__funcion = funcion
+        self.__lote = lote
+        self.__lb = lb
+        self.__ub = ub
+        self.__optimo = optimo
+        self.__dim = dim
+
+    def getNombre(self):
+        return self.__nombre
+
+    def getFuncion(self):
+        return self.__funcion
+
+    def getLote(self):
+        return self.__lote
+
+    def getLb(self):
+        return self.__lb
+
+    def getUb(self):
+        return self.__ub
+
+    def getOptimo(self):
+        return self.__optimo
+
+    def getDimension(self):
+        return self.__dim
+
+    def evaluar(self, x):
+        # Una matriz (N, D) se evalúa completa; un vector, como un solo individuo
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            return self.__lote(x)
+
+        return self.__funcion(x)
+
+def loteCEC(nombre):
+    # opfunu no evalúa poblaciones: se recorre la matriz con el objeto en caché de su dimensión
+    def lote(X):
+        evaluate = funcionCEC(nombre, X.shape[1]).evaluate
+
+        return np.fromiter((evaluate(fila) for fila in X), dtype = float, count = X.shape[0])
+
+    return lote
+
+def resolverBenchmark(nombre):
+    if nombre in FUNCIONES_BEN:
+        # Importado aquí porque Problem.py usa este registro para despachar 'fitness'
+        from Problem.Benchmark import Problem as funciones
+
+        lb, ub, optimo, dim = FUNCIONES_BEN[nombre]
+
+        return Benchmark(nombre, getattr(funciones, nombre), getattr(funciones, f"{nombre}_batch"), lb, ub, optimo, dim)
+
+    if nombre in FUNCIONES_CEC:
+        defecto = funcionCEC(nombre)
+
+        return Benchmark(nombre, lambda x: funcionCEC(nombre, len(x)).evaluate(x), loteCEC(nombre),
+                         defecto.lb[0], defecto.ub[0], defecto.f_global, defecto.dim_default)
+
+    raise ValueError(f"El problema '{nombre}' no es reconocido.")
+
+# Entradas ya resueltas, por nombre
+REGISTRO = {}
+
+def obtenerBenchmark(nombre):
+    if nombre not in REGISTRO:
+        REGISTRO[nombre] = resolverBenchmark(nombre)
+
+    return REGISTRO[nombre]
+
+def evaluar(nombre, x):
+    """
+    Punto de entrada de la evaluación: un individuo (vector) o una población (N, D).
+    """
+    return obtenerBenchmark(nombre).evaluar(x)
@@ -1,5 +1,11 @@
+import time
 import numpy as np
 
+from Problem.cache import cargarInstancia
+from Problem.fitness_cache import evaluateUnique
+from Problem.packed import DTYPE_BINARIO
+from Problem.KP.reduction import reduceKnapsack, PARAMETROS_REDUCCION
+
 # Global dictionary for KP optimal values, similar to 'orden' in SCP
 orden_kp = {
     'kn_f1_l-d_kp_10_269': [0, 295],
@@ -36,6 +42,154 @@ orden_kp = {
     'knapPI_3_10000_1000_1': [30, 146919] # Adjusted index
 }
 
+def read_instance_file(file_path):
+    """
+    Parses a KP instance file ("items capacity" header followed by one "profit weight" line per item).
+    """
+    with open(file_path, 'r') as file:
+        linea = file.readline()
+        if not linea:
+            raise ValueError(f"Instance file '{file_path}' is empty or first line is missing.")
+
+        parts = linea.split(" ")
+        if len(parts) < 2:
+            raise ValueError(f"Instance file '{file_path}' first line format error. Expected items and capacity.")
+
+        items = int(parts[0])
+        capacity = float(parts[1].replace("\n",""))
+
+        weights_list = []
+        profits_list = []
+        i = 1
+        while i <= items:
+            linea = file.readline()
+            if not linea:
+                raise ValueError(f"Instance file '{file_path}' ended prematurely. Expected {items} items.")
+            
+            parts = linea.split(" ")
+            if len(parts) < 2:
+                raise ValueError(f"Instance file '{file_path}' item line format error for item {i}.")
+                
+            profits_list.append(float(parts[0]))
+            weights_list.append(float(parts[1].replace("\n","")))
+            i += 1
+
+    return {
+        'items': items,
+        'capacity': capacity,
+        'weights': np.array(weights_list),
+        'profits': np.array(profits_list)
+    }
+
+# Prefix of the fitness cache keys of evaluate, which repairs feasible solutions too
+CLAVE_REPARACION_TOTAL = b'reparacion_total:'
+
+# Memory (MB) allowed for the dynamic-programming table of the exact solver by default
+DP_MEGABYTES = 256
+
+# Version of knapsackBounds, increased when it changes so cached bounds are recomputed
+VERSION_COTA = 1
+
+def dantzigBound(weights, profits, capacity):
+    """
+    Dantzig bound (LP relaxation): items in descending profit/weight order while they fit,
+    plus the fractional part of the first one that does not. Rounded down when every
+    profit is an integer, since the optimum is then an integer.
+    """
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        ratio = np.where(weights > 0, profits / weights, np.inf)
+
+    order = np.argsort(-ratio, kind = 'stable')
+    load = np.cumsum(weights[order])
+    fitting = int(np.searchsorted(load, capacity, side = 'right'))
+    bound = float(profits[order[:fitting]].sum())
+
+    if fitting < len(order):
+        free = capacity - (load[fitting - 1] if fitting > 0 else 0)
+        bound += float(profits[order[fitting]] * free / weights[order[fitting]])
+
+    if np.all(profits == np.round(profits)):
+        bound = float(np.floor(bound + 1e-9))
+
+    return bound
+
+def exactKnapsack(weights, profits, capacity):
+    """
+    Exact 0/1 knapsack by dynamic programming over the capacity (integer weights), one
+    vectorized update per item. The table of decisions (items x capacity booleans) is kept
+    to rebuild the optimal solution.
+
+    Returns:
+        tuple: Optimal profit and optimal solution.
+    """
+    weights = weights.astype(np.int64)
+    capacity = int(capacity)
+    items = len(weights)
+    best = np.zeros(capacity + 1)
+    take = np.zeros((items, capacity + 1), dtype = bool)
+
+    for i in range(items):
+        w = weights[i]
+
+        if w > capacity:
+            continue
+
+        candidate = best[: capacity + 1 - w] + profits[i]
+        better = candidate > best[w:]
+        take[i, w:] = better
+        best[w:] = np.where(better, candidate, best[w:])
+
+    solution = np.zeros(items, dtype = DTYPE_BINARIO)
+    remaining = capacity
+
+    for i in range(items - 1, -1, -1):
+        if take[i, remaining]:
+            solution[i] = 1
+            remaining -= weights[i]
+
+    return float(best[capacity]), solution
+
+def dpFits(weights, capacity, megabytes):
+    # The exact solver needs integer weights and its table (items x capacity bytes) within 'megabytes'
+    weights = np.asarray(weights, dtype = float)
+    integral = np.all(weights == np.round(weights)) and weights.min() >= 0
+
+    return bool(integral) and len(weights) * (int(capacity) + 1) <= megabytes * 1024 * 1024
+
+def knapsackBounds(weights, profits, capacity, megabytes = DP_MEGABYTES):
+    """
+    Upper bound of a KP instance: the exact optimum when the instance has integer weights
+    and the dynamic-programming table (items x capacity bytes) fits in 'megabytes', and the
+    Dantzig bound otherwise.
+
+    Returns:
+        dict: Bound ('cota'), Dantzig bound, whether the bound is exact, computation time
+        and, when exact, the optimal solution.
+    """
+    start = time.time()
+    weights = np.asarray(weights, dtype = float)
+    profits = np.asarray(profits, dtype = float)
+    bounds = {'cota_dantzig': dantzigBound(weights, profits, capacity)}
+
+    if dpFits(weights, capacity, megabytes):
+        optimum, solution = exactKnapsack(weights, profits, capacity)
+        bounds.update({'cota': optimum, 'exacto': True, 'solucion': solution})
+    else:
+        bounds.update({'cota': bounds['cota_dantzig'], 'exacto': False})
+
+    bounds['tiempo'] = time.time() - start
+    # Budget the bound was computed with, kept with the cached bound
+    bounds['dp_megabytes'] = float(megabytes)
+
+    return bounds
+
+def gapKP(fitness, bound):
+    # Relative distance (%) of the fitness below the upper bound
+    if bound == 0:
+        return 0.0
+
+    return 100 * (bound - fitness) / bound
+
 class KP:
     def __init__(self, instance_basename):
         self.__items = 0
@@ -43,7 +197,17 @@ class KP:
         self.__weights = []
         self.__profits = []
         self.__tradeOff = []
+        self.__order = None
         self.__optimum = 0
+        self.__fitness_cache = None
+        self.__evaluations = 0
+        self.__instance_path = None
+        self.__bounds = None
+        self.__original_items = 0
+        self.__core = None
+        self.__fixed_items = None
+        self.__fixed_profit = 0
+        self.__reduction = {}
         self.read_instance(instance_basename)
 
     def getItems(self):
@@ -75,10 +239,25 @@ class KP:
 
     def setTradeOff(self, tradeoff):
         self.__tradeOff = tradeoff
+        # The repair order (ascending trade-off) is sorted once per instance
+        self.__order = np.argsort(tradeoff)
+
+    def getOrder(self):
+        return self.__order
 
     def getOptimum(self):
         return self.__optimum
 
+    def setFitnessCache(self, cache):
+        self.__fitness_cache = cache
+
+    def getFitnessCache(self):
+        return self.__fitness_cache
+
+    def getEvaluations(self):
+        # Accumulated number of solutions actually repaired and evaluated
+        return self.__evaluations
+
     def setOptimum(self, optimum):
         self.__optimum = optimum
 
@@ -89,41 +268,21 @@ class KP:
         return None # Or raise an error, or return a default
 
     def read_instance(self, instance_basename):
-        self.setOptimum(self._get_optimum_value(instance_basename))
-
         filename = f"{instance_basename}"
 
         file_path = f'./Problem/KP/Instances/{filename}'
+        self.__instance_path = file_path
 
         try:
-            with open(file_path, 'r') as file:
-                linea = file.readline()
-                if not linea:
-                    raise ValueError(f"Instance file '{file_path}' is empty or first line is missing.")
-
-                parts = linea.split(" ")
-                if len(parts) < 2:
-                    raise ValueError(f"Instance file '{file_path}' first line format error. Expected items and capacity.")
-
-                items = int(parts[0])
-                capacity = float(parts[1].replace("\n",""))
-
-                weights_list = []
-                profits_list = []
-                i = 1
-                while i <= items:
-                    linea = file.readline()
-                    if not linea:
-                        raise ValueError(f"Instance file '{file_path}' ended prematurely. Expected {items} items.")
-                    
-                    parts = linea.split(" ")
-                    if len(parts) < 2:
-                        raise ValueError(f"Instance file '{file_path}' item line format error for item {i}.")
-                        
-                    profits_list.append(float(parts[0]))
-                    weights_list.append(float(parts[1].replace("\n","")))
-                    i += 1
+            # The instance is parsed only once, later runs load it from the binary cache (memory-mapped)
+            datos = cargarInstancia('KP', file_path, read_instance_file)
 
+            items = int(datos['items'])
+            capacity = float(datos['capacity'])
+            weights_list = datos['weights']
+            profits_list = datos['profits']
+
+            self.setOptimum(self._get_optimum_value(instance_basename))
             self.setItems(items)
             self.setCapacity(capacity)
             self.setWeights(np.array(weights_list))
@@ -158,8 +317,98 @@ class KP:
             raise
 
 
+    def upperBound(self, megabytes = DP_MEGABYTES):
+        """
+        Upper bound of the instance (exact optimum by dynamic programming when its table fits
+        in 'megabytes', Dantzig bound otherwise, see knapsackBounds). It is computed once and
+        stored in the binary cache next to the instance, tagged with the algorithm version,
+        whether it is exact and the reduction it was computed on; a cached bound with other
+        tags is recomputed (e.g. a Dantzig bound when the budget now allows the exact solver).
+        """
+        weights, profits, capacity = self.getWeights(), self.getProfits(), self.getCapacity()
+        problem = 'KP_cota_reducida' if self.isReduced() else 'KP_cota'
+        parametros = {'algoritmo': 'knapsackBounds', 'version': VERSION_COTA,
+                      'exacto': dpFits(weights, capacity, megabytes),
+                      'reduccion': PARAMETROS_REDUCCION if self.isReduced() else None}
+
+        if self.__bounds is None or self.isBoundExact() != parametros['exacto']:
+            self.__bounds = cargarInstancia(problem, self.__instance_path,
+                                            lambda ruta: knapsackBounds(weights, profits, capacity, megabytes),
+                                            parametros = parametros)
+
+        return self.__bounds['cota'] + self.getFixedProfit()
+
+    def isBoundExact(self):
+        return self.__bounds is not None and bool(self.__bounds['exacto'])
+
+    def getBoundStats(self):
+        if self.__bounds is None:
+            return {}
+
+        return {
+            'cota_superior': self.__bounds['cota'] + self.getFixedProfit(),
+            'cota_dantzig': self.__bounds['cota_dantzig'] + self.getFixedProfit(),
+            'cota_exacta': float(self.isBoundExact()),
+            'cota_tiempo': self.__bounds['tiempo']
+        }
+
+    def reduceInstance(self):
+        """
+        Reduces the instance to its core items (see Problem/KP/reduction.py) and works only
+        with them from then on. Items fixed in leave the knapsack with their weight and their
+        profit is always added to the fitness, so the reported value is still the profit in
+        the original instance. The reduction is stored in the binary cache.
+
+        Returns:
+            dict: Reduction statistics.
+        """
+        weights, profits, capacity = self.getWeights(), self.getProfits(), self.getCapacity()
+        reduction = cargarInstancia('KP_reducida', self.__instance_path,
+                                    lambda ruta: reduceKnapsack(weights, profits, capacity),
+                                    parametros = PARAMETROS_REDUCCION)
+        core = np.asarray(reduction['nucleo'])
+
+        # The reduction solves the whole instance, no search space is left
+        if len(core) == 0:
+            return {}
+
+        self.__original_items = self.getItems()
+        self.__core = core
+        self.__fixed_items = np.asarray(reduction['fijos'])
+        self.__fixed_profit = reduction['beneficio_fijo']
+        self.__reduction = dict(reduction['estadisticas'])
+        self.__bounds = None
+
+        self.setItems(len(core))
+        self.setCapacity(capacity - reduction['peso_fijo'])
+        self.setWeights(np.array(weights[core]))
+        self.setProfits(np.array(profits[core]))
+        self.setTradeOff(np.array(self.getTradeOff()[core]))
+
+        return self.__reduction
+
+    def isReduced(self):
+        return self.__core is not None
+
+    def getFixedProfit(self):
+        return self.__fixed_profit
+
+    def getReductionStats(self):
+        return self.__reduction
+
+    def liftSolution(self, solution):
+        # Maps a solution of the core items back to every item of the original instance
+        if not self.isReduced():
+            return solution
+
+        lifted = np.zeros(self.__original_items, dtype = np.asarray(solution).dtype)
+        lifted[self.__core] = solution
+        lifted[self.__fixed_items] = 1
+
+        return lifted
+
     def fitness(self, solution):
-        return np.dot(solution, self.getProfits())
+        return np.dot(solution, self.getProfits()) + self.getFixedProfit()
 
     def factibilityTest(self, solution):
         validation = np.dot(solution, self.getWeights())
@@ -169,28 +418,144 @@ class KP:
             return True
 
     def repair(self, solution):
-        # ordenamos los tradeoff de menor a mayor
-        orden = np.argsort(self.getTradeOff())
-        factible = self.factibilityTest(solution)
-        i = 0
-        # elimino elementos
-        while not factible:
-            if solution[orden[i]] == 1:
-                solution[orden[i]] = 0
-                factible = self.factibilityTest(solution)
-        
-            i+=1
-        # agrego elementos
-        i = 1
-        pos = -1
-        while factible:
-            if solution[orden[self.getItems() - i]] == 0:
-                solution[orden[self.getItems() - i]] = 1
-                pos = orden[self.getItems() - i]
-                factible = self.factibilityTest(solution)
-            i+=1
-        solution[pos] = 0
+        """
+        Drops the selected items with the lowest profit/weight until the knapsack is
+        feasible, then adds the unselected items with the highest profit/weight, stopping at
+        the first one that does not fit. Both phases follow the cached trade-off order and
+        use cumulative weights instead of re-testing feasibility after every change, so a
+        repair is O(n).
+        """
+        order = self.getOrder()
+        weights = self.getWeights()
+        capacity = self.getCapacity()
+        weight = np.dot(solution, weights)
+
+        if weight > capacity:
+            selected = order[solution[order] == 1]
+            removed = np.cumsum(weights[selected])
+            # First prefix of removals that brings the weight within the capacity
+            last = np.searchsorted(removed, weight - capacity)
+            solution[selected[: last + 1]] = 0
+            weight -= removed[last]
+
+        descending = order[::-1]
+        candidates = descending[solution[descending] == 0]
+        load = weight + np.cumsum(weights[candidates])
+        solution[candidates[: np.searchsorted(load, capacity, side = 'right')]] = 1
+
         return solution
+
+    def repair_batch(self, population):
+        """
+        Repairs every infeasible individual at once, with the same result as repair on each
+        one. Feasible individuals are left as they are, as the population path always did
+        (only evaluate, the objective function of some MHs, repairs every solution). Both
+        phases work on the population reordered by the cached trade-off order: an item is
+        dropped if the selected items before it weigh less than the excess, and an unselected
+        item is added (in descending order) while the cumulative load fits.
+
+        Args:
+            population (np.ndarray): Binary population (one individual per row), modified in place.
+
+        Returns:
+            tuple: Repaired population and number of items changed in each individual.
+        """
+        changes = np.zeros(len(population), dtype = np.int64)
+        weights = self.getWeights()
+        capacity = self.getCapacity()
+        load = population @ weights
+        infeasible = np.flatnonzero(load > capacity)
+
+        if infeasible.size == 0:
+            return population, changes
+
+        order = self.getOrder()
+        ordered = population[infeasible][:, order]
+        orderedWeights = weights[order]
+
+        # Drop: selected items whose preceding selected items do not yet cover the excess
+        selectedWeights = ordered * orderedWeights
+        before = np.cumsum(selectedWeights, axis = 1) - selectedWeights
+        excess = (load[infeasible] - capacity)[:, np.newaxis]
+        drop = (ordered == 1) & (before < excess)
+        ordered[drop] = 0
+        remaining = load[infeasible] - np.where(drop, orderedWeights, 0).sum(axis = 1)
+
+        # Add: unselected items in descending trade-off while the cumulative load fits
+        descending = ordered[:, ::-1]
+        candidateWeights = (descending == 0) * orderedWeights[::-1]
+        fits = remaining[:, np.newaxis] + np.cumsum(candidateWeights, axis = 1) <= capacity
+        add = (descending == 0) & fits
+        descending[add] = 1
+
+        repaired = np.empty_like(ordered)
+        repaired[:, order] = ordered
+        population[infeasible] = repaired
+        changes[infeasible] = drop.sum(axis = 1) + add.sum(axis = 1)
+
+        return population, changes
+
+    def fitness_batch(self, population):
+        # Profit of every individual with one matrix-vector product
+        return population @ self.getProfits() + self.getFixedProfit()
+
+    def grasp_population(self, individuals, alpha):
+        """
+        Builds the whole population with a randomized greedy construction: each individual
+        orders the items by profit/weight scaled by a random factor in [1 - alpha, 1] and
+        takes the longest prefix of that order that fits in the capacity. alpha = 0 is the
+        plain greedy order for every individual.
+        """
+        keys = self.getTradeOff() * (1 - alpha * np.random.rand(individuals, self.getItems()))
+        order = np.argsort(-keys, axis = 1)
+        load = np.cumsum(self.getWeights()[order], axis = 1)
+
+        population = np.zeros((individuals, self.getItems()), dtype = DTYPE_BINARIO)
+        np.put_along_axis(population, order, (load <= self.getCapacity()).astype(DTYPE_BINARIO), axis = 1)
+
+        return population
+
+    def evaluate_batch(self, population):
+        """
+        Repairs the infeasible individuals and computes the fitness of the whole population.
+        Duplicate individuals are evaluated once and, with the fitness cache enabled (see
+        Problem/fitness_cache.py), only individuals not seen before are repaired and evaluated.
+
+        Returns:
+            tuple: Repaired population and fitness of each individual.
+        """
+        def evaluate(individuals):
+            self.__evaluations += len(individuals)
+            individuals, _ = self.repair_batch(individuals)
+
+            return individuals, self.fitness_batch(individuals)
+
+        if self.getFitnessCache() is None:
+            return evaluateUnique(population, evaluate)
+
+        return evaluateUnique(population, lambda individuals: self.getFitnessCache().evaluate(individuals, evaluate))
+
+    def evaluate(self, solution):
+        """
+        Repair and fitness of a single solution (objective function used by some MHs). Unlike
+        evaluate_batch, the repair is always applied, feasible solutions included, so its
+        results are kept in the fitness cache under their own keys (CLAVE_REPARACION_TOTAL).
+        """
+        def evaluate(individuals):
+            self.__evaluations += len(individuals)
+
+            for j in range(len(individuals)):
+                individuals[j] = self.repair(individuals[j])
+
+            return individuals, self.fitness_batch(individuals)
+
+        if self.getFitnessCache() is None:
+            population, fitness = evaluate(solution[np.newaxis, :])
+        else:
+            population, fitness = self.getFitnessCache().evaluate(solution[np.newaxis, :], evaluate,
+                                                                 CLAVE_REPARACION_TOTAL)
+
+        return population[0], fitness[0]
     
 def obtenerOptimoKP(archivoInstancia):
     instancia = archivoInstancia.split('/')[-1].replace('.txt', '')
@@ -0,0 +1,92 @@
+import time
+import numpy as np
+
+# Core-problem reduction of KP instances by reduced-cost fixing (Dembo and Hammer). Items
+# whose profit/weight ratio is far from the break item are fixed in or out; every rule keeps
+# at least one optimal solution, so a solution of the core problem lifts to a solution of the
+# original instance with the same profit (adding the profit of the items fixed in).
+
+# Identifies a reduction computed by reduceKnapsack in the binary cache (the version is
+# increased when the fixing rules change)
+PARAMETROS_REDUCCION = {'algoritmo': 'reduceKnapsack', 'version': 1}
+
+def greedyValue(weights, profits, capacity, order):
+    # Profit of the greedy solution: items in the given order, skipping the ones that do not fit
+    load, value = 0.0, 0.0
+
+    for item in order:
+        if load + weights[item] <= capacity:
+            load += weights[item]
+            value += profits[item]
+
+    return value
+
+def reduceKnapsack(weights, profits, capacity):
+    """
+    Fixes the items whose reduced cost with respect to the break item rules them out of any
+    improving solution. With r = p_b / w_b the ratio of the break item and U the Dantzig
+    bound, forcing item j against its LP value loses at least |p_j - r w_j|, so every such
+    solution is worth at most U - |p_j - r w_j|. When that is below the greedy lower bound,
+    item j is fixed to its LP value.
+
+    Args:
+        weights (np.ndarray): Weight of each item.
+        profits (np.ndarray): Profit of each item.
+        capacity (float): Knapsack capacity.
+
+    Returns:
+        dict: Core items, items fixed in, fixed profit and weight, and reduction statistics.
+    """
+    start = time.time()
+    weights = np.asarray(weights, dtype = float)
+    profits = np.asarray(profits, dtype = float)
+    items = len(weights)
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        ratio = np.where(weights > 0, profits / weights, np.inf)
+
+    order = np.argsort(-ratio, kind = 'stable')
+    load = np.cumsum(weights[order])
+    breakPosition = int(np.searchsorted(load, capacity, side = 'right'))
+
+    fixedIn = np.zeros(items, dtype = bool)
+    fixedOut = np.zeros(items, dtype = bool)
+
+    # Every item fits: the whole knapsack is the optimum
+    if breakPosition == items:
+        fixedIn[:] = True
+    else:
+        breakItem = order[breakPosition]
+        breakRatio = profits[breakItem] / weights[breakItem]
+        free = capacity - (load[breakPosition - 1] if breakPosition > 0 else 0)
+        upper = profits[order[:breakPosition]].sum() + breakRatio * free
+        lower = greedyValue(weights, profits, capacity, order)
+
+        reduced = profits - breakRatio * weights
+        inLP = np.zeros(items, dtype = bool)
+        inLP[order[:breakPosition]] = True
+
+        fixable = upper - np.abs(reduced) < lower
+        fixedIn = fixable & inLP
+        fixedOut = fixable & ~inLP
+        fixedOut[breakItem] = False
+
+    core = np.flatnonzero(~fixedIn & ~fixedOut)
+    fixedItems = np.flatnonzero(fixedIn)
+    fixedProfit = float(profits[fixedItems].sum())
+    fixedWeight = float(weights[fixedItems].sum())
+
+    return {
+        'nucleo': core,
+        'fijos': fixedItems,
+        'beneficio_fijo': fixedProfit,
+        'peso_fijo': fixedWeight,
+        'estadisticas': {
+            'objetos_originales': items,
+            'objetos_reducidos': len(core),
+            'objetos_fijos_dentro': len(fixedItems),
+            'objetos_fijos_fuera': int(fixedOut.sum()),
+            'beneficio_fijo': fixedProfit,
+            'tiempo_reduccion': round(time.time() - start, 3)
+        }
+    }
@@ -0,0 +1,324 @@
+import numpy as np
+
+# Rutinas vectorizadas sobre la matriz de cobertura (CSR/CSC) compartidas por SCP y USCP.
+# Trabajan sobre varias soluciones a la vez (una por fila de la población).
+
+def countDtype(matrix):
+    """
+    Tipo entero más chico para contar coberturas con la matriz (CSR o CSC): una cobertura
+    nunca supera la mayor cantidad de entradas de una fila (o columna) de la matriz.
+    """
+    maximum = int(np.diff(matrix.indptr).max()) if matrix.shape[0] > 0 else 0
+
+    return np.int16 if maximum < np.iinfo(np.int16).max else np.int32
+
+def cheapestColumns(csr, costs):
+    """
+    Para cada fila, la columna de menor costo que la cubre (desempate por menor índice de
+    columna, igual que np.argmin sobre las columnas ordenadas de la fila).
+    """
+    rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+    orden = np.lexsort((csr.indices, costs[csr.indices], rows))
+
+    return csr.indices[orden[csr.indptr[:-1]]]
+
+# Reparación simple: las rondas vectorizadas solo se usan si cada fila no cubierta expande a lo
+# sumo PARES_SIMPLE pares, hasta RONDAS_SIMPLE rondas y mientras tras la primera no quede sin
+# decidir más de la fracción PENDIENTES_SIMPLE; si no, se sigue con la pasada secuencial
+PARES_SIMPLE = 8
+RONDAS_SIMPLE = 32
+PENDIENTES_SIMPLE = 0.5
+
+def groupPositions(pointer, groups):
+    # Posiciones de todos los elementos de los grupos indicados (pointer estilo indptr), concatenadas
+    start = pointer[groups]
+    lens = pointer[np.asarray(groups) + 1] - start
+
+    return np.repeat(start - (np.cumsum(lens) - lens), lens) + np.arange(lens.sum())
+
+def expandColumns(csc, columns):
+    """
+    Expande las filas de cada columna indicada. Con una matriz CSR en vez de CSC expande,
+    de la misma forma, las columnas de cada fila indicada.
+
+    Returns:
+        tuple: (owner, rows) donde owner[k] es la posición en 'columns' de la columna que
+        cubre la fila rows[k].
+    """
+    start = csc.indptr[columns]
+    lens = csc.indptr[np.asarray(columns) + 1] - start
+    owner = np.repeat(np.arange(len(columns)), lens)
+    offsets = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+
+    return owner, csc.indices[np.repeat(start, lens) + offsets]
+
+def randomPermutations(individuals, rows):
+    # Una permutación aleatoria de las filas por individuo (usa la semilla de np.random)
+    return np.argsort(np.random.rand(individuals, rows), axis = 1)
+
+def decidirSecuencial(csc, ind, filas, columns, rows, status):
+    """
+    Pasada secuencial de la reparación simple sobre las filas no cubiertas, en el orden de
+    recorrido de cada individuo: una fila sin decidir agrega su columna si ninguna columna
+    agregada antes la cubre. Respeta las filas ya decididas en 'status' (1 agrega, 2 omite).
+    Solo marca como cubiertas las filas de las columnas agregadas, sin expandir pares.
+    """
+    indptr, indices = csc.indptr, csc.indices
+    covered = None
+    actual = -1
+
+    for k, (i, fila, column, estado) in enumerate(zip(ind.tolist(), filas.tolist(), columns.tolist(), status.tolist())):
+        if i != actual:
+            covered = np.zeros(rows, dtype = bool)
+            actual = i
+
+        if estado == 0:
+            estado = 2 if covered[fila] else 1
+            status[k] = estado
+
+        if estado == 1:
+            covered[indices[indptr[column]: indptr[column + 1]]] = True
+
+    return status
+
+def decidirEnRondas(csc, ind, filas, columns, individuals, rows):
+    """
+    Decisión de la reparación simple en rondas vectorizadas: una fila agrega su columna si
+    ninguna columna agregada antes en el recorrido la cubre, y se omite si alguna la cubre.
+    Cada ronda solo toca las filas recién decididas y sus posteriores. Si tras la primera
+    ronda queda sin decidir más de PENDIENTES_SIMPLE de las filas, o se agotan RONDAS_SIMPLE
+    rondas, devuelve el estado parcial (0 en las filas sin decidir) para la pasada secuencial.
+    """
+    entries = len(ind)
+    position = np.full((individuals, rows), -1, dtype = np.int64)
+    position[ind, filas] = np.arange(entries)
+
+    # Pares (fila posterior, fila anterior) del mismo individuo donde la columna candidata de
+    # la fila anterior cubre a la posterior
+    owner, covered = expandColumns(csc, columns)
+    later = position[ind[owner], covered]
+    keep = later > owner
+    dependent, previous = later[keep], owner[keep]
+    # Pares agrupados por la fila anterior: cada decisión se propaga una sola vez a sus filas posteriores
+    porAnterior = np.argsort(previous, kind = 'stable')
+    punteroAnterior = np.concatenate(([0], np.cumsum(np.bincount(previous, minlength = entries))))
+    # Filas anteriores cuya columna todavía podría cubrir a cada fila
+    pending = np.bincount(dependent, minlength = entries)
+
+    # 0: sin decidir, 1: agrega su columna, 2: ya está cubierta al llegar su turno
+    status = np.zeros(entries, dtype = np.int8)
+    # Filas cuyas anteriores ya se omitieron todas: agregan su columna
+    frontier = np.flatnonzero(pending == 0)
+    rondas = 0
+
+    while frontier.size > 0 and rondas < RONDAS_SIMPLE:
+        status[frontier] = 1
+
+        # Las filas posteriores que cubre una columna recién agregada quedan omitidas
+        posteriores = dependent[porAnterior[groupPositions(punteroAnterior, frontier)]]
+        skipped = np.unique(posteriores[status[posteriores] == 0])
+        status[skipped] = 2
+
+        # Las posteriores de las omitidas tienen una anterior menos que podría cubrirlas
+        posteriores, veces = np.unique(dependent[porAnterior[groupPositions(punteroAnterior, skipped)]],
+                                       return_counts = True)
+        pending[posteriores] -= veces
+        frontier = posteriores[(pending[posteriores] == 0) & (status[posteriores] == 0)]
+        rondas += 1
+
+        # Cadenas de dependencias largas: seguir por rondas no compensa
+        if rondas == 1 and np.count_nonzero(status == 0) > PENDIENTES_SIMPLE * entries:
+            break
+
+    return status
+
+def repairSimpleBatch(csr, csc, cheapest, population, permutations):
+    """
+    Reparación simple de varias soluciones a la vez.
+
+    Equivale a recorrer, para cada individuo, sus filas en el orden de su permutación y
+    agregar la columna más barata de cada fila que siga sin cubrir. Las filas no cubiertas
+    se obtienen con un solo producto disperso, ya ordenadas por individuo y recorrido. Si
+    los pares de dependencia entre ellas son pocos se deciden en rondas vectorizadas (ver
+    decidirEnRondas); si son densos, o las rondas no alcanzan, se decide con la pasada
+    secuencial incremental (ver decidirSecuencial), que no cuesta más que el recorrido original.
+
+    Args:
+        csr, csc: Matriz de cobertura en formato CSR y CSC.
+        cheapest (np.ndarray): Columna más barata de cada fila (ver cheapestColumns).
+        population (np.ndarray): Soluciones a reparar (una por fila), se modifican en el lugar.
+        permutations (np.ndarray): Orden de recorrido de las filas para cada individuo.
+
+    Returns:
+        tuple: Población reparada y cantidad de columnas agregadas a cada individuo.
+    """
+    individuals, rows = population.shape[0], csr.shape[0]
+    counts = np.asarray(csr @ population.T).T
+
+    # Filas no cubiertas de cada individuo en el orden de su recorrido
+    pendiente = (counts == 0)[np.arange(individuals)[:, np.newaxis], permutations]
+    ind = np.nonzero(pendiente)[0]
+    filas = permutations[pendiente]
+    columns = cheapest[filas]
+
+    # Cantidad de pares a expandir (filas cubiertas por cada columna candidata) frente a las filas
+    pares = int(np.diff(csc.indptr)[columns].sum())
+
+    if pares <= PARES_SIMPLE * len(ind):
+        status = decidirEnRondas(csc, ind, filas, columns, individuals, rows)
+    else:
+        status = np.zeros(len(ind), dtype = np.int8)
+
+    if np.any(status == 0):
+        status = decidirSecuencial(csc, ind, filas, columns, rows, status)
+
+    added = status == 1
+    population[ind[added], columns[added]] = 1
+
+    return population, np.bincount(ind[added], minlength = individuals)
+
+def restrictedChoice(degree, costs, unicost, alpha):
+    """
+    Elige, para cada individuo (fila de 'degree'), una columna al azar (con la semilla de
+    np.random) de su lista restringida de candidatas: columnas que cubren alguna fila no
+    cubierta con trade-off costo / cobertura dentro de alpha * (peor - mejor) del mejor.
+    """
+    candidates = degree > 0
+
+    if unicost:
+        score = np.where(candidates, -degree, np.inf)
+    else:
+        score = np.where(candidates, costs / degree, np.inf)
+
+    best = score.min(axis = 1, keepdims = True)
+    worst = np.where(candidates, score, -np.inf).max(axis = 1, keepdims = True)
+    restricted = candidates & (score <= best + alpha * (worst - best))
+
+    return np.argmax(np.where(restricted, np.random.rand(*degree.shape), -1), axis = 1)
+
+def repairGreedyBatch(csr, csc, costs, population, unicost = False, alpha = None):
+    """
+    Reparación greedy (la de repairComplex) de varias soluciones a la vez, en rondas
+    sincronizadas: en cada ronda, cada individuo aún infactible agrega la columna de menor
+    costo / filas no cubiertas que cubre (desempate por menor índice, igual que np.argmin),
+    por lo que cada individuo queda igual que con repairComplex.
+
+    La cantidad de filas no cubiertas que cubre cada columna se mantiene por individuo y se
+    actualiza solo con las filas que se cubren en la ronda.
+
+    Args:
+        csr, csc: Matriz de cobertura en formato CSR y CSC.
+        costs (np.ndarray): Costo de cada columna.
+        population (np.ndarray): Soluciones a reparar (una por fila), se modifican en el lugar.
+        unicost (bool): Con costo unitario se elige directamente la columna que cubre más
+            filas no cubiertas, sin calcular el trade-off.
+        alpha (float): Construcción greedy aleatorizada (GRASP): en cada ronda se elige al
+            azar una columna de la lista restringida de candidatas, las que están a lo más a
+            alpha * (peor - mejor) del mejor trade-off (o de la mayor cobertura en unicost).
+            Con None se elige siempre la mejor.
+
+    Returns:
+        tuple: Población reparada y cantidad de columnas agregadas a cada individuo.
+    """
+    individuals = population.shape[0]
+    counts = np.asarray(csr @ population.T).T.astype(countDtype(csr))
+    uncovered = counts == 0
+    remaining = uncovered.sum(axis = 1)
+    added = np.zeros(individuals, dtype = np.int64)
+
+    # degree[i, j] = filas no cubiertas del individuo i que cubre la columna j
+    degreeDtype = countDtype(csc)
+    degree = np.ascontiguousarray(np.asarray(csc.T @ uncovered.T.astype(degreeDtype)).T.astype(degreeDtype))
+    flatDegree = degree.reshape(-1)
+    active = np.flatnonzero(remaining > 0)
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        while active.size > 0:
+            activeDegree = degree[active]
+
+            if alpha is not None:
+                chosen = restrictedChoice(activeDegree, costs, unicost, alpha)
+            elif unicost:
+                chosen = np.argmax(activeDegree, axis = 1)
+            else:
+                trade_off = np.where(activeDegree > 0, costs / activeDegree, np.inf)
+                chosen = np.argmin(trade_off, axis = 1)
+
+            population[active, chosen] = 1
+            added[active] += 1
+
+            # Filas que cubre la columna elegida por cada individuo
+            owner, rows = expandColumns(csc, chosen)
+            ind = active[owner]
+            newlyCovered = counts[ind, rows] == 0
+            counts[ind, rows] += 1
+
+            # Las columnas de las filas recién cubiertas pierden una fila no cubierta
+            ind, rows = ind[newlyCovered], rows[newlyCovered]
+            rowOwner, rowColumns = expandColumns(csr, rows)
+            flat = ind[rowOwner] * csr.shape[1] + rowColumns
+
+            # Con muchas filas recién cubiertas conviene restar un conteo denso
+            if flat.size > flatDegree.size // 8:
+                flatDegree -= np.bincount(flat, minlength = flatDegree.size)
+            else:
+                np.subtract.at(flatDegree, flat, 1)
+
+            remaining -= np.bincount(ind, minlength = individuals)
+            active = active[remaining[active] > 0]
+
+    return population, added
+
+def pruneRedundantBatch(csr, csc, costs, population):
+    """
+    Poda reverse-delete de varias soluciones factibles a la vez: cada individuo recorre sus
+    columnas por costo descendente (desempate por menor índice) y quita cada columna cuyas
+    filas quedan todas cubiertas por otra columna (cobertura >= 2).
+
+    Las columnas se recorren en rondas: en la ronda k cada individuo revisa su k-ésima
+    columna, por lo que el trabajo total es proporcional a los nnz de las columnas
+    seleccionadas y cada individuo queda igual que con el recorrido secuencial.
+
+    Args:
+        csr, csc: Matriz de cobertura en formato CSR y CSC.
+        costs (np.ndarray): Costo de cada columna.
+        population (np.ndarray): Soluciones a podar (una por fila), se modifican en el lugar.
+
+    Returns:
+        tuple: Población podada, costo quitado y cantidad de columnas quitadas por individuo.
+    """
+    individuals = population.shape[0]
+    counts = np.asarray(csr @ population.T).T.astype(countDtype(csr))
+    removedCost = np.zeros(individuals)
+    removedColumns = np.zeros(individuals, dtype = np.int64)
+
+    ind, col = np.nonzero(population)
+
+    if ind.size == 0:
+        return population, removedCost, removedColumns
+
+    orden = np.lexsort((col, -costs[col], ind))
+    ind, col = ind[orden], col[orden]
+
+    # Posición de cada columna en el recorrido de su individuo, y las columnas agrupadas por ronda
+    rank = np.arange(len(ind)) - np.searchsorted(ind, ind)
+    porRonda = np.argsort(rank, kind = 'stable')
+    limites = np.searchsorted(rank[porRonda], np.arange(rank.max() + 2))
+
+    for k in range(len(limites) - 1):
+        ronda = porRonda[limites[k]: limites[k + 1]]
+        roundInd, roundCol = ind[ronda], col[ronda]
+
+        # Una columna es redundante si ninguna de sus filas depende solo de ella
+        owner, rows = expandColumns(csc, roundCol)
+        critical = np.bincount(owner, weights = counts[roundInd[owner], rows] < 2, minlength = len(ronda))
+        redundant = critical == 0
+
+        population[roundInd[redundant], roundCol[redundant]] = 0
+        removedCost[roundInd[redundant]] += costs[roundCol[redundant]]
+        removedColumns[roundInd[redundant]] += 1
+
+        quitadas = redundant[owner]
+        counts[roundInd[owner[quitadas]], rows[quitadas]] -= 1
+
+    return population, removedCost, removedColumns
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import platform
+import numpy as np
+
+from Problem.packed import DTYPE_BINARIO
+
+# Tamaño de bloque de los productos con la matriz de cobertura (SCP y USCP). En vez de
+# deducirlo del nombre de la instancia se calcula a partir de la forma de la matriz, la
+# cantidad de individuos y un presupuesto de memoria por bloque. La calibración (tamaño de
+# bloque desde el cual np.dot rinde a su máximo en esta máquina) se mide una sola vez por tipo
+# de la matriz y ancho (en potencias de 2) y se guarda en la caché.
+
+RUTA_CALIBRACION = './Cache/calibracion_bloques.json'
+
+# Memoria máxima (MB) de los temporales de un bloque cuando no se indica la opción memoria:<MB>
+MEGABYTES_BLOQUE = 64
+
+# Se incrementa cuando cambia la forma de medir la calibración
+VERSION_CALIBRACION = 2
+
+# Bytes de un elemento de los temporales: los productos se hacen en float64
+BYTES_ELEMENTO = 8
+
+# Ancho mínimo con que se calibra: con menos columnas el costo fijo de np.dot domina
+ANCHO_MINIMO = 64
+
+# Calibraciones ya leídas o medidas en este proceso, por (tipo, ancho)
+_calibraciones = {}
+
+def megabytesBloque(opciones):
+    # Opción memoria:<MB> de los parámetros del experimento
+    try:
+        return float(opciones.get("memoria", MEGABYTES_BLOQUE))
+    except ValueError:
+        raise ValueError(f"Valor inválido para memoria: '{opciones.get('memoria')}'. Se espera la memoria máxima por bloque en MB.")
+
+def claveMaquina():
+    return f"{platform.node()}-{platform.machine()}-{os.cpu_count()}-numpy{np.__version__}"
+
+def anchoCalibracion(columnas):
+    # Potencia de 2 más cercana por arriba, para no calibrar cada instancia por separado
+    return int(2 ** np.ceil(np.log2(max(columnas, ANCHO_MINIMO))))
+
+def medirCalibracion(dtype, columnas, repeticiones = 5, megabytes = MEGABYTES_BLOQUE):
+    """
+    Mide el rendimiento de np.dot (bloque denso del tipo de la matriz de cobertura por una
+    solución binaria) para bloques de 8 a 1024 filas de 'columnas' columnas, sin pasar de
+    'megabytes' por bloque, y devuelve las filas del bloque más chico que alcanza el 90% del
+    mejor rendimiento. Bloques más grandes no aceleran el producto y solo aumentan la memoria.
+    """
+    vector = np.ones(columnas, dtype = DTYPE_BINARIO)
+    maximo = max(8, int(megabytes * 1024 * 1024) // (columnas * np.dtype(dtype).itemsize))
+    rendimientos = {}
+
+    for filas in 2 ** np.arange(3, 11):
+        if filas > maximo:
+            break
+
+        bloque = np.ones((filas, columnas), dtype = dtype)
+        np.dot(bloque, vector)
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            np.dot(bloque, vector)
+        tiempo = max(time.perf_counter() - inicio, 1e-9)
+
+        rendimientos[int(filas)] = filas * columnas * repeticiones / tiempo
+
+    mejor = max(rendimientos.values())
+
+    return min(f for f, r in rendimientos.items() if r >= 0.9 * mejor)
+
+def filasCalibradas(dtype, columnas):
+    """
+    Filas de bloque calibradas en esta máquina para una matriz del tipo y ancho dados, medidas
+    la primera vez y luego leídas de la caché.
+    """
+    ancho = anchoCalibracion(columnas)
+    llave = f"{np.dtype(dtype).name}-{ancho}"
+
+    if llave in _calibraciones:
+        return _calibraciones[llave]
+
+    clave = claveMaquina()
+    guardadas = {}
+
+    try:
+        with open(RUTA_CALIBRACION, 'r') as archivo:
+            guardadas = json.load(archivo)
+    except (OSError, ValueError):
+        pass
+
+    if guardadas.get('version') == VERSION_CALIBRACION and llave in guardadas.get('maquinas', {}).get(clave, {}):
+        _calibraciones[llave] = int(guardadas['maquinas'][clave][llave])
+        return _calibraciones[llave]
+
+    _calibraciones[llave] = medirCalibracion(dtype, ancho)
+
+    if guardadas.get('version') != VERSION_CALIBRACION:
+        guardadas = {'version': VERSION_CALIBRACION, 'maquinas': {}}
+
+    guardadas['maquinas'].setdefault(clave, {})[llave] = _calibraciones[llave]
+
+    try:
+        os.makedirs(os.path.dirname(RUTA_CALIBRACION), exist_ok = True)
+        temporal = f'{RUTA_CALIBRACION}.{os.getpid()}.tmp'
+
+        with open(temporal, 'w') as archivo:
+            json.dump(guardadas, archivo)
+
+        os.replace(temporal, RUTA_CALIBRACION)
+    except OSError as e:
+        print(f"Advertencia: no se pudo guardar la calibración de bloques: {e}")
+
+    return _calibraciones[llave]
+
+def filasPorBloque(filas, columnas, individuos = 1, megabytes = MEGABYTES_BLOQUE, dtype = np.int32):
+    """
+    Filas de la matriz densa por bloque en matrix_dot_1/matrix_dot_batch. Cada fila del bloque
+    ocupa 'columnas' elementos (la copia en float64 del bloque) más 'individuos' elementos del
+    resultado parcial. Se usa el bloque calibrado para el tipo ('dtype') y el ancho de la
+    matriz, sin superar el presupuesto de memoria.
+    """
+    porFila = (columnas + individuos) * BYTES_ELEMENTO
+    limite = int(megabytes * 1024 * 1024) // porFila
+    calibrado = filasCalibradas(dtype, columnas)
+
+    return int(max(1, min(calibrado, limite, filas)))
+
+def individuosPorBloque(filas, columnas, nnz, individuos, megabytes = MEGABYTES_BLOQUE):
+    """
+    Individuos por bloque en los productos dispersos de toda la población. Cada producto CSR
+    por un bloque de individuos convierte los nnz de la matriz al tipo del resultado (costo
+    fijo por bloque) y arma un temporal de 'filas' elementos por individuo, más la copia en
+    float64 del individuo. Se usan los bloques más grandes que entran en el presupuesto.
+    """
+    porIndividuo = (filas + columnas) * BYTES_ELEMENTO
+    limite = (int(megabytes * 1024 * 1024) - nnz * BYTES_ELEMENTO) // porIndividuo
+
+    return int(min(max(1, limite), max(1, individuos)))
+
+def coberturaPorBloques(coverange, population, megabytes = MEGABYTES_BLOQUE):
+    # Producto disperso (individuos x filas) de toda la población, por bloques de individuos
+    filas, columnas = coverange.shape
+    bloque = individuosPorBloque(filas, columnas, coverange.nnz, len(population), megabytes)
+
+    if bloque >= len(population):
+        return np.asarray((coverange @ population.T).T), bloque
+
+    validation = np.empty((len(population), filas), dtype = np.result_type(coverange.dtype, population.dtype))
+
+    for i in range(0, len(population), bloque):
+        validation[i: i + bloque] = (coverange @ population[i: i + bloque].T).T
+
+    return validation, bloque
@@ -0,0 +1,148 @@
+import heapq
+import numpy as np
+
+from Problem.SCP.batch import countDtype, groupPositions
+
+def rowIndices(matrix, rows):
+    # Índices de columna de todas las filas dadas de una matriz CSR, concatenados sin bucles de Python
+    return matrix.indices[groupPositions(matrix.indptr, rows)]
+
+class CoverState:
+    """
+    Estado incremental de una solución del SCP/USCP.
+
+    Mantiene la solución, la cantidad de columnas seleccionadas que cubren cada fila, el
+    conjunto de filas no cubiertas, el costo acumulado y, para cada columna, cuántas filas
+    no cubiertas cubre. Agregar o quitar una columna actualiza todo en tiempo proporcional
+    a las filas que toca la columna (y a las columnas de las filas que cambian de estado),
+    sin recalcular la cobertura completa.
+    """
+    def __init__(self, csr, csc, costs, solution):
+        self.__csr = csr
+        self.__csc = csc
+        self.__costs = costs
+        # La solución se modifica en el lugar, igual que en las reparaciones originales
+        self.__solution = solution
+        self.__counts = np.asarray(csr @ solution).astype(countDtype(csr))
+
+        uncovered = self.__counts == 0
+        self.__uncovered = set(np.flatnonzero(uncovered).tolist())
+        self.__degree = np.asarray(uncovered.astype(np.int32) @ csr).astype(np.int32)
+        self.__cost = float(np.dot(solution, costs))
+
+    def getSolution(self):
+        return self.__solution
+
+    def getCounts(self):
+        return self.__counts
+
+    def getUncovered(self):
+        return self.__uncovered
+
+    def getUncoveredDegree(self):
+        # Cantidad de filas no cubiertas que cubre cada columna
+        return self.__degree
+
+    def getCost(self):
+        return self.__cost
+
+    def isFeasible(self):
+        return len(self.__uncovered) == 0
+
+    def columnRows(self, column):
+        return self.__csc.indices[self.__csc.indptr[column]: self.__csc.indptr[column + 1]]
+
+    def rowColumns(self, row):
+        return self.__csr.indices[self.__csr.indptr[row]: self.__csr.indptr[row + 1]]
+
+    def isRedundant(self, column):
+        # Una columna seleccionada es redundante si todas sus filas quedan cubiertas sin ella
+        return self.__solution[column] == 1 and bool(np.all(self.__counts[self.columnRows(column)] >= 2))
+
+    def __updateDegree(self, rows, delta):
+        """
+        Las columnas de las filas que cambiaron de estado ganan o pierden una fila no cubierta.
+        Los índices de todas las filas se juntan de una vez y cada columna se actualiza con la
+        cantidad de veces que aparece.
+
+        Returns:
+            np.ndarray: Columnas cuyo grado cambió.
+        """
+        if len(rows) == 0:
+            return np.empty(0, dtype = np.int64)
+
+        columns, times = np.unique(rowIndices(self.__csr, rows), return_counts = True)
+        self.__degree[columns] += delta * times
+
+        return columns
+
+    def addColumn(self, column):
+        # Devuelve las columnas cuyo grado cambió (solo esas necesitan recalcular su trade-off)
+        if self.__solution[column] == 1:
+            return np.empty(0, dtype = np.int64)
+
+        self.__solution[column] = 1
+        self.__cost += self.__costs[column]
+
+        rows = self.columnRows(column)
+        self.__counts[rows] += 1
+
+        newlyCovered = rows[self.__counts[rows] == 1]
+        self.__uncovered.difference_update(newlyCovered.tolist())
+
+        return self.__updateDegree(newlyCovered, -1)
+
+    def removeColumn(self, column):
+        if self.__solution[column] == 0:
+            return np.empty(0, dtype = np.int64)
+
+        self.__solution[column] = 0
+        self.__cost -= self.__costs[column]
+
+        rows = self.columnRows(column)
+        self.__counts[rows] -= 1
+
+        newlyUncovered = rows[self.__counts[rows] == 0]
+        self.__uncovered.update(newlyUncovered.tolist())
+
+        return self.__updateDegree(newlyUncovered, 1)
+
+def repairLazyGreedy(state, clave):
+    """
+    Reparación greedy con un heap de actualización perezosa sobre un CoverState: elige en
+    cada paso la columna de menor clave (desempate por menor índice), igual que un argmin
+    sobre todas las columnas que cubren filas no cubiertas.
+
+    La clave de una columna solo puede aumentar al cubrirse filas (su grado solo baja), así
+    que la guardada en el heap es una cota inferior. Al agregar una columna solo se marcan
+    como sucias las columnas de las filas recién cubiertas; una columna sucia que llega al
+    tope se recalcula y se reinserta (o se descarta si ya no cubre filas pendientes), y una
+    limpia en el tope es la elegida.
+
+    Args:
+        state (CoverState): Estado de la solución a reparar (se modifica en el lugar).
+        clave (callable): Clave de una columna o de un arreglo de columnas según el grado actual.
+
+    Returns:
+        np.ndarray: Solución reparada.
+    """
+    degree = state.getUncoveredDegree()
+    candidates = np.flatnonzero(degree)
+    heap = list(zip(clave(candidates).tolist(), candidates.tolist()))
+    heapq.heapify(heap)
+    dirty = np.zeros(len(degree), dtype = bool)
+
+    while not state.isFeasible():
+        key, column = heapq.heappop(heap)
+
+        if dirty[column]:
+            dirty[column] = False
+
+            if degree[column] > 0:
+                heapq.heappush(heap, (float(clave(column)), column))
+
+            continue
+
+        dirty[state.addColumn(column)] = True
+
+    return state.getSolution()
@@ -0,0 +1,121 @@
+import time
+import numpy as np
+
+from Problem.SCP.batch import repairGreedyBatch
+
+# Cota inferior de SCP/USCP por relajación lagrangiana de las restricciones de cobertura,
+# optimizada con subgradiente (Beasley, 1990). Para multiplicadores u >= 0:
+#   L(u) = sum_i u_i + sum_j min(0, c_j - sum_{i cubierta por j} u_i) <= óptimo
+
+# Parámetros por defecto del subgradiente y versión del algoritmo (se incrementa al cambiarlo
+# para que no se reutilicen cotas guardadas en la caché)
+MAX_ITER = 1000
+PACIENCIA = 20
+MIN_PASO = 0.005
+VERSION_COTA = 1
+
+def parametrosCota(unicost = False, reduccion = None, maxIter = MAX_ITER, paciencia = PACIENCIA, minPaso = MIN_PASO):
+    # Identifica en la caché una cota calculada con cotaLagrangiana (y, sobre la instancia
+    # reducida, la reducción de la que parte)
+    return {'algoritmo': 'cotaLagrangiana', 'version': VERSION_COTA, 'unicost': unicost,
+            'maxIter': maxIter, 'paciencia': paciencia, 'minPaso': minPaso, 'reduccion': reduccion}
+
+def valorLagrangiano(csr, costs, multipliers):
+    # Valor de la relajación y solución que la alcanza (columnas con costo reducido negativo)
+    reduced = costs - multipliers @ csr
+    solution = reduced < 0
+
+    return multipliers.sum() + reduced[solution].sum(), solution
+
+def cotaLagrangiana(csr, csc, costs, unicost = False, maxIter = MAX_ITER, paciencia = PACIENCIA, minPaso = MIN_PASO):
+    """
+    Calcula una cota inferior del costo óptimo con el método del subgradiente.
+
+    El paso es f * (UB - L(u)) / ||g||^2, con UB el costo de la solución greedy (la de
+    repairComplex desde la solución vacía) y g = 1 - cobertura de la solución de la relajación.
+    f parte en 2 y se divide a la mitad tras 'paciencia' iteraciones sin mejorar la cota.
+
+    Args:
+        csr, csc: Matriz de cobertura en formato CSR y CSC.
+        costs (np.ndarray): Costo de cada columna.
+        unicost (bool): Costo unitario (cambia solo la solución greedy inicial).
+        maxIter (int): Máximo de iteraciones del subgradiente.
+        paciencia (int): Iteraciones sin mejora antes de reducir f.
+        minPaso (float): Valor de f con el que se detiene el método.
+
+    Returns:
+        dict: Cota ('cota', redondeada hacia arriba si los costos son enteros), costo de la
+        solución greedy ('cota_superior'), iteraciones, tiempo y multiplicadores.
+    """
+    inicio = time.time()
+    costs = np.asarray(costs, dtype = float)
+    rows = csr.shape[0]
+
+    greedy, _ = repairGreedyBatch(csr, csc, costs, np.zeros((1, csr.shape[1]), dtype = np.int64), unicost)
+    upper = float(greedy[0] @ costs)
+
+    # Multiplicadores iniciales: menor costo por fila cubierta entre las columnas de cada fila
+    degree = np.diff(csc.indptr)
+    ratio = costs / np.maximum(degree, 1)
+    entryRows = np.repeat(np.arange(rows), np.diff(csr.indptr))
+    multipliers = np.full(rows, np.inf)
+    np.minimum.at(multipliers, entryRows, ratio[csr.indices])
+
+    best, bestMultipliers = -np.inf, multipliers.copy()
+    paso, sinMejora, iteraciones = 2.0, 0, 0
+
+    for iteraciones in range(1, maxIter + 1):
+        value, solution = valorLagrangiano(csr, costs, multipliers)
+
+        if value > best + 1e-9:
+            best, bestMultipliers, sinMejora = value, multipliers.copy(), 0
+        else:
+            sinMejora += 1
+
+            if sinMejora >= paciencia:
+                paso, sinMejora = paso / 2, 0
+
+        # Subgradiente: filas no cubiertas (+1) o cubiertas de más (negativo) por la relajación
+        subgradient = 1 - csr @ solution.astype(np.int64)
+        # Los multiplicadores en 0 no pueden bajar, su componente no aporta a la dirección
+        subgradient[(multipliers <= 0) & (subgradient < 0)] = 0
+        norma = float(subgradient @ subgradient)
+
+        if norma == 0 or paso < minPaso or upper - best <= 1e-9:
+            break
+
+        multipliers = np.maximum(0, multipliers + paso * (upper - value) / norma * subgradient)
+
+    # Con costos enteros el óptimo es entero, por lo que la cota se puede redondear hacia arriba
+    if np.all(costs == np.round(costs)):
+        best = float(np.ceil(best - 1e-6))
+
+    return {
+        'cota': min(float(best), upper),
+        'cota_superior': upper,
+        'iteraciones': iteraciones,
+        'tiempo': time.time() - inicio,
+        'multiplicadores': bestMultipliers
+    }
+
+def gapObjetivo(opciones):
+    # Opción stop:gap<=x de los parámetros del experimento (gap en porcentaje); None si no se indica
+    criterio = opciones.get("stop")
+
+    if criterio is None:
+        return None
+
+    if not criterio.startswith("gap<="):
+        raise ValueError(f"Valor inválido para stop: '{criterio}'. Se espera gap<=x (gap en porcentaje).")
+
+    try:
+        return float(criterio[len("gap<="):])
+    except ValueError:
+        raise ValueError(f"Valor inválido para stop: '{criterio}'. Se espera gap<=x (gap en porcentaje).")
+
+def calcularGap(fitness, cota):
+    # Distancia relativa (%) del fitness a la cota inferior
+    if fitness == 0:
+        return 0.0
+
+    return 100 * (fitness - cota) / fitness
@@ -0,0 +1,58 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Parser de archivos en formato Beasley (OR-Library), compartido por SCP y USCP:
+#   filas columnas
+#   costo de cada columna (columnas valores)
+#   por cada fila: cantidad de columnas que la cubren, seguida de esas columnas (base 1)
+
+def leerBeasley(ruta, unicost = False):
+    """
+    Lee un archivo en formato Beasley tokenizándolo completo en una sola llamada y arma
+    directamente los arreglos CSR de la matriz de cobertura, sin matriz densa intermedia.
+
+    Args:
+        ruta (str): Ruta del archivo de la instancia.
+        unicost (bool): Ignora los costos del archivo y usa costo 1 para todas las columnas.
+
+    Returns:
+        tuple: (filas, columnas, costos, indptr, indices), con los índices de cada fila
+        ordenados y sin repetidos.
+    """
+    with open(ruta, 'r') as archivo:
+        tokens = np.fromstring(archivo.read(), dtype = np.int64, sep = ' ')
+
+    filas, columnas = int(tokens[0]), int(tokens[1])
+
+    if unicost:
+        costos = np.ones(columnas, dtype = np.int64)
+    else:
+        costos = tokens[2: 2 + columnas].copy()
+
+    datos = tokens[2 + columnas:]
+
+    # Posición de la cabecera (cantidad de columnas) de cada fila: cada una depende del
+    # largo de la anterior, por lo que es el único recorrido secuencial (uno por fila)
+    cabeceras = np.empty(filas, dtype = np.int64)
+    posicion = 0
+
+    for fila in range(filas):
+        cabeceras[fila] = posicion
+        posicion += int(datos[posicion]) + 1
+
+    esIndice = np.ones(len(datos), dtype = bool)
+    esIndice[cabeceras] = False
+    esIndice[posicion:] = False
+
+    indptr = np.zeros(filas + 1, dtype = np.int64)
+    np.cumsum(datos[cabeceras], out = indptr[1:])
+    indices = datos[esIndice] - 1
+
+    coverange = csr_matrix(
+        (np.ones(len(indices), dtype = np.int32), indices.astype(np.int32), indptr.astype(np.int32)),
+        shape = (filas, columnas)
+    )
+    # Columnas repetidas en una fila cuentan una sola vez, igual que en la matriz densa
+    coverange.sum_duplicates()
+
+    return filas, columnas, costos, coverange.indptr, coverange.indices
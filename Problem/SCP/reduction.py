@@ -0,0 +1,172 @@
+import time
+import numpy as np
+
+# Reducción clásica de instancias SCP/USCP (filas/columnas dominadas y columnas fijas).
+# Todas las reglas conservan al menos una solución óptima, por lo que una solución del
+# problema reducido se traslada a una solución factible del original con el mismo costo
+# (sumando el costo de las columnas fijas).
+
+# Identifica en la caché una reducción calculada con reduceCoverage (la versión se incrementa
+# al cambiar las reglas)
+PARAMETROS_REDUCCION = {'algoritmo': 'reduceCoverage', 'version': 1}
+
+def containedPairs(matrix, chunk = 512):
+    """
+    Busca los pares de columnas (j, k), j != k, donde las filas de j están contenidas en
+    las filas de k. Las columnas se comparan por bloques para acotar la memoria.
+
+    Args:
+        matrix: Matriz dispersa CSC.
+        chunk (int): Cantidad de columnas por bloque.
+
+    Returns:
+        tuple: Arreglos (j, k) con los pares encontrados.
+    """
+    columns = matrix.shape[1]
+    degree = np.diff(matrix.indptr)
+    transposed = matrix.T.tocsr()
+    pairsJ, pairsK = [np.zeros(0, dtype = np.int64)], [np.zeros(0, dtype = np.int64)]
+
+    for start in range(0, columns, chunk):
+        # overlap[j, k] = filas en común entre la columna j del bloque y la columna k
+        overlap = (transposed[start: start + chunk] @ matrix).tocoo()
+        j = overlap.row + start
+        k = overlap.col
+
+        contained = (overlap.data == degree[j]) & (j != k)
+        pairsJ.append(j[contained])
+        pairsK.append(k[contained])
+
+    return np.concatenate(pairsJ), np.concatenate(pairsK)
+
+def costDominated(csr, costs):
+    """
+    Columnas cuyo costo supera estrictamente la suma, sobre sus filas, de la columna
+    alternativa más barata de cada fila. Ninguna solución óptima las usa.
+    """
+    rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+    entryCosts = costs[csr.indices].astype(float)
+
+    # Columna más barata y segundo menor costo de cada fila
+    orden = np.lexsort((entryCosts, rows))
+    first = csr.indptr[:-1]
+    cheapestColumn = csr.indices[orden[first]]
+    cheapest = entryCosts[orden[first]]
+    second = np.full(csr.shape[0], np.inf)
+    hasSecond = np.diff(csr.indptr) > 1
+    second[hasSecond] = entryCosts[orden[first[hasSecond] + 1]]
+
+    alternative = np.where(cheapestColumn[rows] == csr.indices, second[rows], cheapest[rows])
+    total = np.bincount(csr.indices, weights = alternative, minlength = csr.shape[1])
+
+    return costs > total
+
+def reduceCoverage(csr, costs):
+    """
+    Reduce una instancia aplicando hasta llegar a un punto fijo:
+      - Columnas fijas: una fila cubierta por una sola columna obliga a usarla; las filas
+        que cubre esa columna se eliminan.
+      - Columnas vacías: columnas que ya no cubren ninguna fila.
+      - Filas dominadas: si las columnas de la fila i están contenidas en las de la fila r,
+        cubrir i cubre r, por lo que r se elimina.
+      - Columnas dominadas: una columna contenida en otra de costo menor o igual, o cuyo
+        costo supera la suma de las columnas alternativas más baratas de sus filas.
+
+    Args:
+        csr: Matriz de cobertura en formato CSR (filas x columnas).
+        costs (np.ndarray): Costo de cada columna.
+
+    Returns:
+        dict: Filas y columnas (índices originales) que se conservan, columnas fijas,
+        costo fijo y estadísticas de la reducción.
+    """
+    inicio = time.time()
+    costs = np.asarray(costs)
+    rows, columns = csr.shape
+
+    activeRows = np.ones(rows, dtype = bool)
+    activeColumns = np.ones(columns, dtype = bool)
+    fixed = np.zeros(columns, dtype = bool)
+    removed = {'filas_dominadas': 0, 'columnas_dominadas': 0, 'columnas_vacias': 0}
+    rondas = 0
+    changed = True
+
+    while changed:
+        rondas += 1
+
+        rowIndex = np.flatnonzero(activeRows)
+        columnIndex = np.flatnonzero(activeColumns)
+        sub = csr[rowIndex][:, columnIndex].tocsr()
+        rowDegree = np.diff(sub.indptr)
+        columnDegree = np.bincount(sub.indices, minlength = len(columnIndex))
+
+        # Columnas fijas: filas cubiertas por una sola columna
+        single = rowDegree == 1
+
+        if np.any(single):
+            newFixed = np.unique(sub.indices[sub.indptr[:-1][single]])
+            covered = np.asarray(sub[:, newFixed].sum(axis = 1)).ravel() > 0
+
+            fixed[columnIndex[newFixed]] = True
+            activeColumns[columnIndex[newFixed]] = False
+            activeRows[rowIndex[covered]] = False
+            continue
+
+        # Columnas que ya no cubren filas activas
+        empty = columnDegree == 0
+
+        if np.any(empty):
+            removed['columnas_vacias'] += int(empty.sum())
+            activeColumns[columnIndex[empty]] = False
+            continue
+
+        # Filas dominadas: se elimina la fila que contiene a otra (entre filas idénticas se
+        # conserva la de menor índice)
+        i, r = containedPairs(sub.T.tocsc())
+        dominated = np.zeros(len(rowIndex), dtype = bool)
+        dominated[r[(rowDegree[i] < rowDegree[r]) | (i < r)]] = True
+
+        if np.any(dominated):
+            removed['filas_dominadas'] += int(dominated.sum())
+            activeRows[rowIndex[dominated]] = False
+            continue
+
+        # Columnas dominadas: contenidas en otra columna preferida según (costo, más filas,
+        # menor índice), un orden total que garantiza que la columna que reemplaza se conserva
+        subCosts = costs[columnIndex]
+        order = np.lexsort((np.arange(len(columnIndex)), -columnDegree, subCosts))
+        rank = np.empty(len(columnIndex), dtype = np.int64)
+        rank[order] = np.arange(len(columnIndex))
+
+        j, k = containedPairs(sub.tocsc())
+        dominated = np.zeros(len(columnIndex), dtype = bool)
+        dominated[j[rank[k] < rank[j]]] = True
+        dominated |= costDominated(sub, subCosts)
+
+        if np.any(dominated):
+            removed['columnas_dominadas'] += int(dominated.sum())
+            activeColumns[columnIndex[dominated]] = False
+            continue
+
+        changed = False
+
+    fixedColumns = np.flatnonzero(fixed)
+    fixedCost = float(costs[fixedColumns].sum())
+
+    return {
+        'filas': np.flatnonzero(activeRows),
+        'columnas': np.flatnonzero(activeColumns),
+        'fijas': fixedColumns,
+        'costo_fijo': fixedCost,
+        'estadisticas': {
+            'filas_originales': rows,
+            'columnas_originales': columns,
+            'filas_reducidas': int(activeRows.sum()),
+            'columnas_reducidas': int(activeColumns.sum()),
+            'columnas_fijas': len(fixedColumns),
+            'costo_fijo': fixedCost,
+            'rondas_reduccion': rondas,
+            'tiempo_reduccion': round(time.time() - inicio, 3),
+            **removed
+        }
+    }
@@ -1,6 +1,15 @@
-import random
 import numpy as np
-from scipy.sparse import csr_matrix
+from scipy.sparse import csr_matrix, issparse
+
+from Problem.cache import cargarInstancia
+from Problem.fitness_cache import evaluateUnique
+from Problem.packed import DTYPE_BINARIO, PackedPopulation
+from Problem.SCP.cover_state import CoverState, repairLazyGreedy
+from Problem.SCP.batch import countDtype, randomPermutations, repairSimpleBatch, repairGreedyBatch, pruneRedundantBatch
+from Problem.SCP.reduction import reduceCoverage, PARAMETROS_REDUCCION
+from Problem.SCP.parser import leerBeasley
+from Problem.SCP.lagrangian import cotaLagrangiana, parametrosCota
+from Problem.SCP.blocks import MEGABYTES_BLOQUE, filasPorBloque, coberturaPorBloques
 
 def matrix_dot_1(A, B, block_size):
     # Inicializar el resultado con ceros (es un vector de tamaño n)
@@ -29,6 +38,16 @@ def matrix_dot_2(A, B, block_size):
     
     return result
 
+def matrix_dot_batch(A, P, block_size):
+    # Cobertura de cada individuo de la población P (una fila por individuo) contra la matriz densa A
+    C = np.zeros((P.shape[0], A.shape[0]))
+    
+    for i in range(0, A.shape[0], block_size):
+        # Seleccionar un bloque de filas de A y multiplicarlo por toda la población
+        C[:, i: i + block_size] = np.dot(P, A[i: i + block_size, :].T)
+        
+    return C
+
 orden = {
     'uscp41': [0, 38], 'uscp42': [1, 37], 'uscp43': [2, 38], 'uscp44': [3, 38], 'uscp45': [4, 38],
     'uscp46': [5, 37], 'uscp47': [6, 38], 'uscp48': [7, 37], 'uscp49': [8, 38], 'uscp410': [9, 38],
@@ -47,42 +66,68 @@ orden = {
     'uscpcyc11': [70, 3968], 'uscpclr10': [71, 25], 'uscpclr11': [72, 23], 'uscpclr12': [73, 23], 'uscpclr13': [74, 23]
 }
 
+def leerInstanciaUSCP(ruta):
+    """
+    Parsea un archivo en formato Beasley y devuelve la matriz de cobertura como arreglos CSR
+    (indptr/indices, ordenados y sin repetidos) junto con los costos. El óptimo conocido no
+    se guarda en la caché: se lee de la tabla de óptimos en cada carga.
+    """
+    filas, columnas, costos, indptr, indices = leerBeasley(ruta, unicost = True)
+
+    return {
+        'filas': filas,
+        'columnas': columnas,
+        'costos': costos,
+        'indptr': indptr,
+        'indices': indices
+    }
+
 class USCP:
-    def __init__(self, instance):
+    def __init__(self, instance, sparse = True):
         self.__rows = 0
         self.__columns = 0
         self.__coverage = []
+        self.__coverage_csr = None
+        self.__coverage_csc = None
+        self.__sparse = sparse
         self.__cost = []
+        self.__cheapest = None
         self.__optimum = 0
         self.__block_size = 0
-        
-        if len(instance) == 6:
-            if instance[4] == '4' or instance[4] == '5' or instance[4] == '6':
-                self.__block_size = 40
-            
-            elif instance[4] == 'a' or instance[4] == 'b':
-                self.__block_size = 30
-            
-            elif instance[4] == 'c' or instance[4] == 'd':
-                self.__block_size = 20
-            
-        else:
-            if instance[6] == 'e' or instance[6] == 'f':
-                self.__block_size = 10
-            
-            elif instance[6] == 'g' or instance[6] == 'h':
-                self.__block_size = 120
-            
-            elif 'cyc' in instance or 'clr' in instance:
-                self.__block_size = 20
-        
-            else:
-                self.__block_size = 1
+        self.__batch_block_size = 0
+        self.__instance_path = None
+        self.__original_columns = 0
+        self.__column_map = None
+        self.__fixed_columns = None
+        self.__fixed_cost = 0
+        self.__reduction = {}
+        self.__fitness_cache = None
+        self.__evaluations = 0
+        self.__block_megabytes = MEGABYTES_BLOQUE
+        self.__bound = None
+        self.__prune = False
+        self.__pruned_cost = 0
+        self.__pruned_columns = 0
         
         self.readInstance(instance)
 
     def getBlockSizes(self):
         return self.__block_size
+    
+    def getBatchBlockSize(self):
+        # Individuos por bloque usados en el último producto de cobertura disperso de la población
+        return self.__batch_block_size
+    
+    def setBlockMemory(self, megabytes):
+        # Presupuesto de memoria (MB) de los temporales de cada bloque de los productos
+        self.__block_megabytes = megabytes
+        self.updateBlockSize()
+    
+    def updateBlockSize(self):
+        # Filas por bloque de la matriz densa, según su forma y el presupuesto de memoria
+        if not self.isSparse():
+            self.__block_size = filasPorBloque(self.getRows(), self.getColumns(), 1, self.__block_megabytes,
+                                               self.getCoverange().dtype)
 
     def getRows(self):
         return self.__rows
@@ -100,13 +145,53 @@ class USCP:
         return self.__coverage
     
     def setCoverange(self, coverange):
+        # Además de la matriz en uso se guardan sus versiones dispersas CSR (filas) y CSC (columnas),
+        # que son las que usan las reparaciones aun cuando se trabaja con la matriz densa
+        if issparse(coverange):
+            coverange = csr_matrix(coverange)
+            self.__coverage_csr = coverange
+        else:
+            self.__coverage_csr = csr_matrix(coverange)
+            
+        self.__coverage_csc = self.__coverage_csr.tocsc()
         self.__coverage = coverange
+        self.__cheapest = None
+        self.updateBlockSize()
+    
+    def getCoverangeCSR(self):
+        return self.__coverage_csr
+    
+    def getCoverangeCSC(self):
+        return self.__coverage_csc
+    
+    def isSparse(self):
+        return self.__sparse
+    
+    def getRowColumns(self, row):
+        # Columnas que cubren la fila indicada, en orden ascendente
+        coverange = self.getCoverangeCSR()
+        
+        return coverange.indices[coverange.indptr[row]: coverange.indptr[row + 1]]
+    
+    def coverState(self, solution):
+        # Estado incremental (coberturas por fila, filas no cubiertas y costo) de la solución
+        return CoverState(self.getCoverangeCSR(), self.getCoverangeCSC(), self.getCost(), solution)
 
     def getCost(self):
         return self.__cost
 
     def setCost(self, cost):
         self.__cost = cost
+        self.__cheapest = None
+    
+    def getCheapestColumns(self):
+        # Con costo unitario la columna más barata de cada fila es la de menor índice, que es la
+        # primera de la fila en la matriz CSR (índices ordenados)
+        if self.__cheapest is None:
+            coverange = self.getCoverangeCSR()
+            self.__cheapest = coverange.indices[coverange.indptr[:-1]]
+            
+        return self.__cheapest
 
     def getOptimum(self):
         return self.__optimum
@@ -115,68 +200,124 @@ class USCP:
         self.__optimum = optimum
 
     def readInstance(self, instance):
-        
         dirSCP = './Problem/USCP/Instances/'
         
         instance = dirSCP + instance + ".txt" 
+        self.__instance_path = instance
         
-        self.setOptimum(self.obtenerOptimoUSCP(instance))
+        # La instancia se parsea una sola vez y luego se carga desde la caché binaria (memory-map)
+        datos = cargarInstancia('USCP', instance, leerInstanciaUSCP)
         
-        file = open(instance, 'r')
+        # El óptimo se toma de la tabla y no de la caché, para que no quede desactualizado
+        self.setOptimum(obtenerOptimoUSCP(instance))
+        self.setRows(int(datos['filas']))
+        self.setColumns(int(datos['columnas']))
 
-        # Lectura de las dimensiones del problema
-        line = file.readline().split()
-        self.setRows(int(line[0]))
-        self.setColumns(int(line[1]))
+        indices = datos['indices']
+        coverange = csr_matrix(
+            (np.ones(len(indices), dtype = np.int32), indices, datos['indptr']),
+            shape = (self.getRows(), self.getColumns())
+        )
+        # Los unos de la matriz en el entero más chico que no desborda las coberturas: con la
+        # población en uint8 los productos dan directamente coberturas int16/int32
+        coverange.data = coverange.data.astype(countDtype(coverange))
 
-        # Lectura de los costos
-        costos = []
-        line = file.readline()
-        countDim = 1
+        if self.isSparse():
+            self.setCoverange(coverange)
+        else:
+            self.setCoverange(coverange.toarray())
+            
+        self.setCost(np.array(datos['costos']))
+    
+    def reduceInstance(self):
+        """
+        Reduce la instancia (filas/columnas dominadas y columnas fijas, ver
+        Problem/SCP/reduction.py) y pasa a trabajar solo con las filas y columnas que quedan.
+        Las columnas fijas se suman siempre al fitness, por lo que el valor reportado sigue
+        siendo el costo en la instancia original. La reducción se guarda en la caché binaria.
 
-        while line != "" and countDim <= self.getColumns():
-            values = line.split()
-            for i in range(len(values)):
-                costos.append(1)
-                countDim +=1
-            line = file.readline()
+        Returns:
+            dict: Estadísticas de la reducción.
+        """
+        csr = self.getCoverangeCSR()
+        costs = self.getCost()
         
-        # print("Costos para cada columna: "+str(costos))
-        # print("Cantidad de costos para cada columna: "+str(costos.__len__()))
-
-        # Preparar matriz de restricciones (matriz A)
-        constrains = np.zeros((self.getRows(),self.getColumns()), dtype = np.int32).tolist()
-
-        # Lecutra de Restricciones
-        row = 0
-
-        while line != "":
-            numUnos = int(line)
-            # print("Cantidad de columnas que cubre la fila "+str(row)+": "+str(numUnos))
-            countUnos = 0
+        # La caché de la reducción se valida contra el mismo archivo fuente de la instancia
+        reduccion = cargarInstancia('USCP_reducida', self.__instance_path, lambda ruta: reduceCoverage(csr, costs),
+                                   parametros = PARAMETROS_REDUCCION)
+        filas = np.asarray(reduccion['filas'])
+        columnas = np.asarray(reduccion['columnas'])
+        
+        # Si la reducción resuelve la instancia completa no queda espacio de búsqueda
+        if len(columnas) == 0:
+            return {}
+        
+        self.__original_columns = self.getColumns()
+        self.__column_map = columnas
+        self.__fixed_columns = np.asarray(reduccion['fijas'])
+        self.__fixed_cost = reduccion['costo_fijo']
+        self.__reduction = dict(reduccion['estadisticas'])
+        self.__bound = None
+        
+        reducida = csr[filas][:, columnas].tocsr()
+        
+        self.setRows(len(filas))
+        self.setColumns(len(columnas))
+        
+        if self.isSparse():
+            self.setCoverange(reducida)
+        else:
+            self.setCoverange(reducida.toarray())
             
-            line = file.readline()
-            line = line.replace('\n',"").replace('\\n',"")
-
-            while line != "" and countUnos < numUnos:
-                columns = line.split()
-                
-                for i in range(len(columns)):
-                    column = int(columns[i]) - 1
-                    constrains[row][column] = 1
-                    countUnos +=1
-                line = file.readline()
-            # print("Coberturas para la fila "+str(row)+": "+str(constrains[row]))
-            # print("Suma de validacion: "+str(sum(constrains[row])))
+        self.setCost(np.array(costs[columnas]))
+        
+        return self.__reduction
+    
+    def isReduced(self):
+        return self.__column_map is not None
+    
+    def getFixedCost(self):
+        return self.__fixed_cost
+    
+    def getReductionStats(self):
+        return self.__reduction
+    
+    def lowerBound(self):
+        """
+        Cota inferior lagrangiana (ver Problem/SCP/lagrangian.py) de la instancia en uso más el
+        costo de las columnas fijas. Se calcula una sola vez y se guarda en la caché binaria
+        junto con la instancia (aparte para la instancia reducida).
+        """
+        if self.__bound is None:
+            csr, csc, costs = self.getCoverangeCSR(), self.getCoverangeCSC(), self.getCost()
+            problema = 'USCP_cota_reducida' if self.isReduced() else 'USCP_cota'
             
-            row += 1
+            self.__bound = cargarInstancia(problema, self.__instance_path,
+                                           lambda ruta: cotaLagrangiana(csr, csc, costs, unicost = True),
+                                           parametros = parametrosCota(unicost = True, reduccion = PARAMETROS_REDUCCION if self.isReduced() else None))
         
-        file.close()
-
-        self.setCoverange(np.array(constrains))
-        self.setCost(np.array(costos))
-        # print("Chequeo de cobertura: "+str(constrains[0][90]))
+        return self.__bound['cota'] + self.getFixedCost()
+    
+    def getBoundStats(self):
+        if self.__bound is None:
+            return {}
+        
+        return {
+            'cota_inferior': self.lowerBound(),
+            'cota_iteraciones': self.__bound['iteraciones'],
+            'cota_tiempo': self.__bound['tiempo']
+        }
     
+    def liftSolution(self, solution):
+        # Traslada una solución de la instancia reducida a las columnas de la instancia original
+        if not self.isReduced():
+            return solution
+        
+        lifted = np.zeros(self.__original_columns, dtype = np.asarray(solution).dtype)
+        lifted[self.__column_map] = solution
+        lifted[self.__fixed_columns] = 1
+        
+        return lifted
     
     def obtenerInstancia(self, archivoInstancia):
     # Extraemos el nombre de la instancia, eliminando la extensión .txt
@@ -190,9 +331,13 @@ class USCP:
         return orden.get(clave_instancia, [None])[1]  # Devuelve el óptimo si existe, sino None
 
     def factibilityTest(self, solution):
-        check = True        
-        validation = matrix_dot_1(self.getCoverange(), solution, self.__block_size)
-        
+        check = True
+        # Con la matriz dispersa la multiplicación solo recorre los unos de la matriz
+        if self.isSparse():
+            validation = self.getCoverange() @ solution  # Multiplicación dispersa
+        else:
+            validation = matrix_dot_1(self.getCoverange(), solution, self.__block_size)
+
         if 0 in validation:
             check = False
         
@@ -204,59 +349,208 @@ class USCP:
             
         if repairType == 'complex':
             solution = self.repairComplex(solution)
+            
+        if repairType == 'greedy_fast':
+            solution = self.repairGreedyFast(solution)
         
         return solution
 
     def repairSimple(self, solution):
-        reparaciones = 0
-        indices = list(range(self.getRows()))
-        coverange = self.getCoverange()
-        costs = self.getCost()
-
-        random.shuffle(indices)
+        # Las filas se recorren en orden aleatorio (permutación con la semilla de np.random) y
+        # cada fila sin cubrir agrega su columna más barata, resuelto en pasadas vectorizadas
+        permutation = np.random.permutation(self.getRows())
         
-        for i in indices:
-            if np.sum(coverange[i] * solution) < 1:
-                idx = np.argwhere(coverange[i] > 0)
-                # print(f'columnas que satisfacen la restriccion: {idx}')
-                idxLowcost = idx[np.argmin(costs[idx])]
-                # print(f'indice del menor costo: {idxLowcost}')
-                solution[idxLowcost[0]] = 1
-                reparaciones += 1
-        # print(f'total de reparaciones realizadas: {reparaciones}')
+        repairSimpleBatch(self.getCoverangeCSR(), self.getCoverangeCSC(), self.getCheapestColumns(),
+                          solution[np.newaxis, :], permutation[np.newaxis, :])
         
         return solution
     
+    def repair_batch(self, population, repairType):
+        """
+        Repara todos los individuos infactibles de la población a la vez. Cada individuo
+        queda igual que con repair: 'simple' usa un orden aleatorio de filas por individuo y
+        'complex'/'greedy_fast' agregan columnas greedy en rondas sincronizadas (las dos dan
+        las mismas columnas, así que comparten la versión por población).
+
+        Args:
+            population (np.ndarray): Población binaria (un individuo por fila), se modifica en el lugar.
+            repairType (str): Tipo de reparación ('simple', 'complex' o 'greedy_fast').
+
+        Returns:
+            tuple: Población reparada y cantidad de columnas agregadas a cada individuo.
+        """
+        feasible, _ = self.coverage_batch(population)
+        infeasible = np.flatnonzero(~feasible)
+        repairs = np.zeros(len(population), dtype = np.int64)
+        
+        if infeasible.size == 0:
+            return population, repairs
+        
+        csr, csc = self.getCoverangeCSR(), self.getCoverangeCSC()
+        
+        # repairSimpleBatch decide por rondas solo cuando le conviene; en instancias densas (clr)
+        # recorre cada individuo en forma secuencial, así que nunca cuesta más que repairSimple por fila
+        if repairType == 'simple':
+            repaired, repairs[infeasible] = repairSimpleBatch(
+                csr, csc, self.getCheapestColumns(), population[infeasible],
+                randomPermutations(infeasible.size, self.getRows()))
+            population[infeasible] = repaired
+        
+        if repairType == 'complex' or repairType == 'greedy_fast':
+            repaired, repairs[infeasible] = repairGreedyBatch(csr, csc, self.getCost(), population[infeasible], unicost = True)
+            population[infeasible] = repaired
+            
+        return population, repairs
+    
+    def setPrune(self, prune):
+        # Activa la poda de columnas redundantes tras cada reparación
+        self.__prune = prune
+    
+    def getPruneStats(self):
+        return {
+            'poda_costo_eliminado': self.__pruned_cost,
+            'poda_columnas_eliminadas': self.__pruned_columns
+        }
+    
+    def prune_batch(self, population):
+        """
+        Quita las columnas redundantes de cada individuo factible, por costo descendente (ver
+        pruneRedundantBatch), y acumula el costo y las columnas quitadas.
+
+        Returns:
+            np.ndarray: Población podada (modificada en el lugar).
+        """
+        population, removedCost, removedColumns = pruneRedundantBatch(
+            self.getCoverangeCSR(), self.getCoverangeCSC(), self.getCost(), population)
+        self.__pruned_cost += float(removedCost.sum())
+        self.__pruned_columns += int(removedColumns.sum())
+        
+        return population
+    
+    def grasp_population(self, individuals, alpha):
+        """
+        Construye una población factible con greedy aleatorizado (GRASP) desde soluciones
+        vacías, todos los individuos a la vez (ver repairGreedyBatch). 'alpha' es el ancho de
+        la lista restringida de candidatas: 0 es el greedy puro y 1 cualquier columna útil.
+        """
+        population = np.zeros((individuals, self.getColumns()), dtype = DTYPE_BINARIO)
+        population, _ = repairGreedyBatch(self.getCoverangeCSR(), self.getCoverangeCSC(), self.getCost(),
+                                          population, unicost = True, alpha = alpha)
+        
+        return population
+    
+    def repair_simple_batch(self, population):
+        # Reparación simple de toda la población, cada individuo con su propio orden de filas
+        return self.repair_batch(population, 'simple')
+    
     def repairComplex(self, solution):
-        # Convertir la matriz de cobertura a formato disperso CSR si no está ya en ese formato
-        set_sparse = csr_matrix(self.getCoverange())  # Cobertura en formato disperso
-        costs = self.getCost()
-        # Realizar la prueba de factibilidad inicial
-        feasible, aux = self.factibilityTest(solution)
-        reparaciones = 0
-        
-        while not feasible: # repetimos hasta que la solución sea factible
-            # Crear un vector disperso para restricciones no cubiertas
-            r_no_cubiertas = (aux == 0).astype(np.int32) 
-            # Calcular la cantidad de restricciones no cubiertas que cubre cada columna usando multiplicación dispersa
-            cnc = r_no_cubiertas @ set_sparse  # Operador @ realiza np.dot en formato disperso
-            # Obtener los índices de columnas que cubren restricciones no cubiertas
-            indices = np.nonzero(cnc)[0]  
-            # Calcular el trade-off entre costos y cobertura
-            trade_off = costs[indices] / cnc[indices]
-            # Seleccionar la columna con el menor trade-off
-            idx = np.argmin(trade_off)
-            # Actualizar la solución asignando 1 a la columna seleccionada
-            solution[indices[idx]] = 1
-            # Verificar factibilidad nuevamente
-            feasible, aux = self.factibilityTest(solution)
-            reparaciones += 1
+        # El estado incremental evita recalcular la cobertura completa tras cada columna agregada
+        state = self.coverState(solution)
+        
+        while not state.isFeasible():  # repetimos hasta que la solución sea factible
+            # Con costo unitario el menor trade-off 1 / cnc es la columna que cubre más
+            # restricciones no cubiertas (desempate por menor índice, igual que antes)
+            state.addColumn(int(np.argmax(state.getUncoveredDegree())))
+        
+        return state.getSolution()
+
+    def repairGreedyFast(self, solution):
+        """
+        Reparación greedy equivalente a repairComplex (mismas columnas y mismos desempates),
+        con las columnas en un heap de actualización perezosa en vez de un argmax sobre todas
+        las columnas tras cada inserción (ver repairLazyGreedy). Con costo unitario la clave
+        es solo la cantidad de filas no cubiertas que cubre la columna (negada), sin divisiones.
+        """
+        state = self.coverState(solution)
+        degree = state.getUncoveredDegree()
+        
+        return repairLazyGreedy(state, lambda columns: -degree[columns])
+
+    def setFitnessCache(self, cache):
+        self.__fitness_cache = cache
+    
+    def getFitnessCache(self):
+        return self.__fitness_cache
+    
+    def getEvaluations(self):
+        # Cantidad acumulada de soluciones efectivamente reparadas y evaluadas
+        return self.__evaluations
+    
+    def evaluate_batch(self, population, repairType):
+        """
+        Repara (y poda, si está activa) y evalúa toda la población. Los individuos repetidos
+        se evalúan una sola vez y, con la caché de fitness activa (ver Problem/fitness_cache.py),
+        solo se reparan y evalúan los individuos no vistos antes.
+
+        Returns:
+            tuple: Población reparada y fitness de cada individuo.
+        """
+        def evaluate(individuals):
+            self.__evaluations += len(individuals)
+            individuals, _ = self.repair_batch(individuals, repairType)
             
-        return solution
+            if self.__prune:
+                individuals = self.prune_batch(individuals)
+            
+            return individuals, self.fitness_batch(individuals)
+        
+        if self.getFitnessCache() is None:
+            return evaluateUnique(population, evaluate)
+        
+        return evaluateUnique(population, lambda individuals: self.getFitnessCache().evaluate(individuals, evaluate))
+    
+    def evaluate(self, solution, repairType):
+        # Reparación y fitness de una sola solución (función objetivo de las MH que la usan)
+        if self.getFitnessCache() is None:
+            self.__evaluations += 1
+            solution = self.repair(solution, repairType)
+            
+            if self.__prune:
+                solution = self.prune_batch(solution[np.newaxis, :])[0]
+            
+            return solution, self.fitness(solution)
+        
+        population, fitness = self.evaluate_batch(solution[np.newaxis, :], repairType)
+        
+        return population[0], fitness[0]
+    
+    def coverage_batch(self, population):
+        """
+        Calcula la cobertura de toda la población con productos matriz-matriz por bloques.
+
+        Args:
+            population (np.ndarray): Población binaria (un individuo por fila).
+
+        Returns:
+            tuple: Máscara de factibilidad por individuo y matriz (individuos x filas) con la
+            cantidad de columnas seleccionadas que cubren cada fila.
+        """
+        population = np.asarray(population)
+        
+        # Los productos se hacen por bloques para acotar la memoria de los temporales
+        if self.isSparse():
+            validation, self.__batch_block_size = coberturaPorBloques(self.getCoverange(), population, self.__block_megabytes)
+        else:
+            blockSize = filasPorBloque(self.getRows(), self.getColumns(), len(population), self.__block_megabytes,
+                                       self.getCoverange().dtype)
+            validation = matrix_dot_batch(self.getCoverange(), population, blockSize)
+        
+        feasible = np.all(validation > 0, axis = 1)
+        
+        return feasible, validation
+    
+    def fitness_batch(self, population):
+        # Con costo unitario el fitness es la cantidad de columnas seleccionadas: popcount de la
+        # población empaquetada (64 columnas por palabra); una población densa se empaqueta antes
+        if not isinstance(population, PackedPopulation):
+            population = PackedPopulation.pack(population)
+        
+        return population.popcount() + self.getFixedCost()
 
     def fitness(self, solution):
-        return matrix_dot_2(solution, self.getCost(), self.__block_size)
-            
+        # Popcount de la solución empaquetada en vez del producto contra el vector de costos (todos 1)
+        return self.fitness_batch(solution)[0]
+    
 def obtenerOptimoUSCP(archivoInstancia):
     instancia = archivoInstancia.split('/')[-1].replace('.txt', '')
     
@@ -0,0 +1,148 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# Caché binaria de instancias: cada instancia se compila una sola vez a archivos .npy
+# (uno por arreglo) más un meta.json con los escalares y el checksum del archivo fuente.
+# Las cargas posteriores abren los .npy con memory-map, sin volver a parsear el texto.
+# Las entradas derivadas (cotas, reducciones) guardan además el algoritmo, su versión y sus
+# parámetros, y se recalculan cuando no coinciden con los pedidos.
+
+DIR_CACHE = './Cache/instancias/'
+
+# Se incrementa cuando cambia el formato de lo que se guarda en la caché
+VERSION_CACHE = 2
+
+def checksum(ruta):
+    """Calcula el SHA-1 del archivo fuente leyendo por bloques."""
+    sha = hashlib.sha1()
+
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(bloque)
+
+    return sha.hexdigest()
+
+def directorioCache(problema, ruta):
+    nombre = os.path.basename(ruta).replace('.txt', '')
+
+    return os.path.join(DIR_CACHE, problema, nombre)
+
+def leerMeta(directorio):
+    ruta_meta = os.path.join(directorio, 'meta.json')
+
+    if not os.path.exists(ruta_meta):
+        return None
+
+    try:
+        with open(ruta_meta, 'r') as archivo:
+            return json.load(archivo)
+
+    except (OSError, ValueError):
+        return None
+
+def normalizarParametros(parametros):
+    # Los parámetros tal como quedan al leerlos del meta.json (tuplas como listas, etc.)
+    return json.loads(json.dumps(parametros))
+
+def esValida(meta, ruta, parametros = None):
+    """
+    Verifica que la caché corresponda al archivo fuente actual y a los parámetros pedidos
+    (algoritmo, versión y parámetros con que se calculó una entrada derivada). Si el tamaño
+    y la fecha de modificación coinciden no se vuelve a leer el archivo; en otro caso se
+    compara el checksum.
+    """
+    if meta is None or meta.get('version') != VERSION_CACHE:
+        return False
+
+    if meta.get('parametros') != normalizarParametros(parametros):
+        return False
+
+    estado = os.stat(ruta)
+
+    if meta['size'] == estado.st_size and meta['mtime_ns'] == estado.st_mtime_ns:
+        return True
+
+    return meta['checksum'] == checksum(ruta)
+
+def guardar(directorio, ruta, datos, parametros = None):
+    """Escribe los arreglos y el meta.json; el meta se escribe al final para que los lectores nunca vean una caché a medias."""
+    os.makedirs(directorio, exist_ok=True)
+
+    arreglos = {}
+    escalares = {}
+
+    for clave, valor in datos.items():
+        if isinstance(valor, np.ndarray):
+            arreglos[clave] = valor
+        else:
+            escalares[clave] = valor
+
+    # Archivos temporales con el pid para que dos procesos compilando la misma instancia no se pisen
+    for clave, valor in arreglos.items():
+        temporal = os.path.join(directorio, f'{clave}.{os.getpid()}.tmp.npy')
+        np.save(temporal, valor)
+        os.replace(temporal, os.path.join(directorio, f'{clave}.npy'))
+
+    estado = os.stat(ruta)
+    meta = {
+        'version': VERSION_CACHE,
+        'checksum': checksum(ruta),
+        'size': estado.st_size,
+        'mtime_ns': estado.st_mtime_ns,
+        'parametros': normalizarParametros(parametros),
+        'arreglos': sorted(arreglos.keys()),
+        'escalares': escalares
+    }
+
+    temporal = os.path.join(directorio, f'meta.{os.getpid()}.tmp.json')
+
+    with open(temporal, 'w') as archivo:
+        json.dump(meta, archivo)
+
+    os.replace(temporal, os.path.join(directorio, 'meta.json'))
+
+    return meta
+
+def cargar(directorio, meta):
+    datos = dict(meta['escalares'])
+
+    for clave in meta['arreglos']:
+        datos[clave] = np.load(os.path.join(directorio, f'{clave}.npy'), mmap_mode = 'r')
+
+    return datos
+
+def cargarInstancia(problema, ruta, compilar, forzar = False, parametros = None):
+    """
+    Devuelve los datos de una instancia desde la caché binaria.
+
+    Args:
+        problema (str): Tipo de problema ('SCP', 'USCP', 'KP'), define la subcarpeta de la caché.
+        ruta (str): Ruta del archivo fuente de la instancia.
+        compilar (callable): Función que parsea el archivo fuente y devuelve un diccionario
+            de arreglos numpy y escalares.
+        forzar (bool): Recompila aunque la caché sea válida.
+        parametros (dict): Algoritmo, versión y parámetros de una entrada derivada; si no
+            coinciden con los guardados la entrada se vuelve a calcular.
+
+    Returns:
+        dict: Arreglos (memory-mapped, solo lectura) y escalares de la instancia.
+    """
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"El archivo de instancia '{ruta}' no existe.")
+
+    directorio = directorioCache(problema, ruta)
+    meta = leerMeta(directorio)
+
+    if forzar or not esValida(meta, ruta, parametros):
+        datos = compilar(ruta)
+
+        try:
+            meta = guardar(directorio, ruta, datos, parametros)
+        except OSError as e:
+            # Sin permisos de escritura se sigue trabajando con los datos recién parseados
+            print(f"Advertencia: no se pudo escribir la caché de '{ruta}': {e}")
+            return datos
+
+    return cargar(directorio, meta)
@@ -0,0 +1,137 @@
+import numpy as np
+
+from collections import OrderedDict
+
+from Problem.packed import PackedPopulation
+
+# Caché LRU de evaluaciones para problemas binarios (SCP, USCP, KP). La clave es la solución
+# binarizada empaquetada (ver Problem/packed.py) y se guarda la solución reparada (también empaquetada)
+# junto con su fitness, de modo que una solución ya vista no se vuelve a reparar ni a evaluar.
+
+# Memoria aproximada que ocupa cada entrada además de los bytes de la clave y la solución
+# (objetos bytes, tupla y nodo del OrderedDict)
+OVERHEAD_ENTRADA = 200
+
+def megabytesCache(opciones):
+    # Opción cache:<MB> de los parámetros del experimento; 0 o ausente desactiva la caché
+    try:
+        return float(opciones.get("cache", 0))
+    except ValueError:
+        raise ValueError(f"Valor inválido para cache: '{opciones.get('cache')}'. Se espera la memoria máxima en MB.")
+
+class FitnessCache:
+    def __init__(self, maxMegabytes):
+        self.__entries = OrderedDict()
+        self.__maxBytes = int(maxMegabytes * 1024 * 1024)
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def getHits(self):
+        return self.__hits
+
+    def getMisses(self):
+        return self.__misses
+
+    def getStats(self):
+        total = self.__hits + self.__misses
+
+        return {
+            'cache_aciertos': self.__hits,
+            'cache_fallos': self.__misses,
+            'cache_tasa_aciertos': self.__hits / total if total > 0 else 0.0,
+            'cache_entradas': len(self.__entries),
+            'cache_desalojos': self.__evictions,
+            'cache_bytes': self.__bytes
+        }
+
+    def key(self, solution):
+        return PackedPopulation.pack(solution).rowKeys()[0]
+
+    def get(self, key):
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+
+        return entry
+
+    def put(self, key, repaired, fitness):
+        if key in self.__entries:
+            return
+
+        packed = np.packbits(np.asarray(repaired) != 0).tobytes()
+        self.__entries[key] = (packed, fitness)
+        self.__bytes += len(key) + len(packed) + OVERHEAD_ENTRADA
+
+        # Se descartan las entradas usadas hace más tiempo hasta respetar la memoria máxima
+        while self.__bytes > self.__maxBytes and self.__entries:
+            oldKey, (oldPacked, _) = self.__entries.popitem(last = False)
+            self.__bytes -= len(oldKey) + len(oldPacked) + OVERHEAD_ENTRADA
+            self.__evictions += 1
+
+    def evaluate(self, population, evaluate, prefijo = b''):
+        """
+        Evalúa una población usando la caché: los individuos ya vistos toman la solución
+        reparada y el fitness guardados; el resto se evalúa con una sola llamada a 'evaluate'.
+
+        Args:
+            population (np.ndarray): Población binarizada (un individuo por fila), se modifica en el lugar.
+            evaluate (callable): Recibe las filas no encontradas y devuelve (reparadas, fitness).
+            prefijo (bytes): Prefijo de las claves, para separar evaluaciones con otra regla de
+                reparación sobre la misma solución binarizada.
+
+        Returns:
+            tuple: Población reparada y fitness de cada individuo.
+        """
+        dim = population.shape[1]
+        fitness = np.zeros(len(population))
+        keys = [prefijo + key for key in PackedPopulation.pack(population).rowKeys()]
+        misses = []
+
+        for i, key in enumerate(keys):
+            entry = self.get(key)
+
+            if entry is None:
+                misses.append(i)
+                continue
+
+            packed, fitness[i] = entry
+            population[i] = np.unpackbits(np.frombuffer(packed, dtype = np.uint8), count = dim)
+
+        if misses:
+            repaired, missFitness = evaluate(population[misses])
+            population[misses] = repaired
+            fitness[misses] = missFitness
+
+            for i, j in enumerate(misses):
+                self.put(keys[j], repaired[i], missFitness[i])
+
+        return population, fitness
+
+def evaluateUnique(population, evaluate):
+    """
+    Evalúa una sola vez cada individuo distinto de la población (filas idénticas tras la
+    binarización, p. ej. copias de best con ELIT) y reparte los resultados a sus copias.
+
+    Args:
+        population (np.ndarray): Población binarizada (un individuo por fila), se modifica en el lugar.
+        evaluate (callable): Recibe las filas distintas y devuelve (reparadas, fitness).
+
+    Returns:
+        tuple: Población reparada y fitness de cada individuo.
+    """
+    first, inverse = PackedPopulation.pack(population).unique()
+
+    if len(first) == len(population):
+        return evaluate(population)
+
+    repaired, fitness = evaluate(population[first])
+    population[:] = repaired[inverse]
+
+    return population, np.asarray(fitness)[inverse]
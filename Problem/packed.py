@@ -0,0 +1,115 @@
+import numpy as np
+
+# Población binaria empaquetada en palabras uint64 (64 variables por palabra, bit j de la
+# palabra w = variable 64 * w + j). Las MH siguen trabajando sobre la población densa en el
+# espacio continuo; la versión empaquetada es la que se guarda entre iteraciones (matrixBin)
+# y la que usan la diversidad, la deduplicación y la caché de fitness.
+
+BITS_PALABRA = 64
+
+# Tipo de las poblaciones binarias densas (la que se binariza, repara y evalúa)
+DTYPE_BINARIO = np.uint8
+
+def dtypeContinuo(opciones):
+    # Opción precision:float32 de los parámetros del experimento para el lado continuo de las MH
+    precision = opciones.get("precision", "float64")
+
+    if precision not in ("float32", "float64"):
+        raise ValueError(f"Valor inválido para precision: '{precision}'. Se espera float32 o float64.")
+
+    return np.dtype(precision).type
+
+# Cantidad de unos de cada byte, para numpy sin np.bitwise_count (anterior a 2.0)
+POPCOUNT_BYTE = np.unpackbits(np.arange(256, dtype = np.uint8)[:, np.newaxis], axis = 1).sum(axis = 1)
+
+def popcountWords(words):
+    # Cantidad de unos por fila de una matriz de palabras uint64
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis = -1, dtype = np.int64)
+
+    return POPCOUNT_BYTE[words.view(np.uint8)].sum(axis = -1, dtype = np.int64)
+
+class PackedPopulation:
+    def __init__(self, words, dim):
+        self.__words = words
+        self.__dim = dim
+
+    @classmethod
+    def pack(cls, population):
+        """
+        Empaqueta una población (un individuo por fila; cualquier valor distinto de 0 es un 1).
+        Un vector se trata como una población de un individuo.
+        """
+        bits = np.atleast_2d(np.asarray(population) != 0)
+        dim = bits.shape[1]
+        words = -(-dim // BITS_PALABRA)
+
+        packed = np.zeros((bits.shape[0], words * 8), dtype = np.uint8)
+        packed[:, : -(-dim // 8)] = np.packbits(bits, axis = 1, bitorder = 'little')
+
+        return cls(packed.view('<u8'), dim)
+
+    def unpack(self, dtype = DTYPE_BINARIO):
+        # Población densa (un individuo por fila); con dtype float queda en el espacio continuo de las MH
+        bits = np.unpackbits(self.__words.view(np.uint8), axis = 1, count = self.__dim, bitorder = 'little')
+
+        return bits.astype(dtype, copy = False)
+
+    def __len__(self):
+        return self.__words.shape[0]
+
+    def __getitem__(self, i):
+        # Individuo i como vector denso (igual que una fila de la población sin empaquetar)
+        bits = np.unpackbits(self.__words[i].view(np.uint8), count = self.__dim, bitorder = 'little')
+
+        return bits.astype(DTYPE_BINARIO)
+
+    def getDimension(self):
+        return self.__dim
+
+    def getWords(self):
+        return self.__words
+
+    def nbytes(self):
+        return self.__words.nbytes
+
+    def copy(self):
+        return PackedPopulation(self.__words.copy(), self.__dim)
+
+    def popcount(self):
+        # Cantidad de variables en 1 de cada individuo
+        return popcountWords(self.__words)
+
+    def hamming(self, other):
+        """
+        Distancia de Hamming de cada individuo a la fila correspondiente de 'other', o a
+        'other' para todos si tiene un solo individuo (p. ej. la distancia a best).
+        """
+        return popcountWords(self.__words ^ other.getWords())
+
+    def columnSums(self, chunk = 4096):
+        # Cantidad de individuos con cada variable en 1, desempaquetando por bloques de individuos
+        sums = np.zeros(self.__dim, dtype = np.int64)
+
+        for start in range(0, len(self), chunk):
+            bits = np.unpackbits(self.__words[start: start + chunk].view(np.uint8), axis = 1,
+                                 count = self.__dim, bitorder = 'little')
+            sums += bits.sum(axis = 0, dtype = np.int64)
+
+        return sums
+
+    def rowKeys(self):
+        # Clave (bytes) de cada individuo, para diccionarios como la caché de fitness
+        return [row.tobytes() for row in self.__words]
+
+    def unique(self):
+        """
+        Individuos distintos de la población.
+
+        Returns:
+            tuple: Posición de la primera aparición de cada individuo distinto y, para cada
+            individuo, el índice de su representante en esa lista.
+        """
+        _, first, inverse = np.unique(self.__words, axis = 0, return_index = True, return_inverse = True)
+
+        return first, inverse.reshape(-1)
@@ -1,7 +1,7 @@
 import numpy as np
 
 from Diversity.imports import diversidadHussain
-from Problem.Benchmark.Problem import fitness as f
+from Problem.Benchmark.registry import evaluar
 from Metaheuristics.imports import metaheuristics, MH_ARG_MAP
 
 def initialize_population(mh, pop, dim, lb, ub):
@@ -27,13 +27,14 @@ def evaluate_population(mh, population, fitness, _, lb, ub, function):
         pBest = np.zeros_like(population)
         pBestScore = np.full(population.shape[0], float("inf"))
     
-    for i in range(population.shape[0]):
-        population[i] = np.clip(population[i], lb, ub)
-        fitness[i] = f(function, population[i])
-        
-        if mh == 'PSO' and pBestScore[i] > fitness[i]:
-            pBestScore[i] = fitness[i]
-            pBest[i] = population[i].copy()
+    # Toda la población se acota y se evalúa de una vez (versiones por población de F1-F23)
+    population[:] = np.clip(population, lb, ub)
+    fitness[:] = evaluar(function, population)
+    
+    if mh == 'PSO':
+        mejora = fitness < pBestScore
+        pBestScore[mejora] = fitness[mejora]
+        pBest[mejora] = population[mejora]
 
     solutionsRanking = np.argsort(fitness)
     bestIndex = solutionsRanking[0]
@@ -46,28 +47,24 @@ def update_population(population, fitness, _, lb, ub, function, best, bestFitnes
     # Aplicar límites a toda la población
     population = np.clip(population, lb, ub)
 
-    # Evaluar fitness de toda la población (bucle explícito)
-    for i in range(population.shape[0]):
-        fitness[i] = f(function, population[i])
+    # Evaluar fitness de toda la población en una sola llamada
+    fitness[:] = evaluar(function, population)
 
     # Comparar y actualizar posibles mejoras para LOA
     if mh == 'LOA' and posibles_mejoras is not None:
         posibles_mejoras = np.clip(posibles_mejoras, lb, ub)
+        mejoras_fitness = evaluar(function, posibles_mejoras)
         
-        for i in range(posibles_mejoras.shape[0]):
-            mejora_fitness = f(function, posibles_mejoras[i])
-            
-            if mejora_fitness < fitness[i]:
-                population[i] = posibles_mejoras[i]
-                fitness[i] = mejora_fitness
+        # Cada posible mejora compite con el individuo de la misma fila
+        mejora = np.flatnonzero(mejoras_fitness < fitness[: len(mejoras_fitness)])
+        population[mejora] = posibles_mejoras[mejora]
+        fitness[mejora] = mejoras_fitness[mejora]
 
     # Actualizar pBest para PSO
     if mh == 'PSO':
-        for i in range(population.shape[0]):
-            
-            if fitness[i] < pBestScore[i]:
-                pBestScore[i] = fitness[i]
-                pBest[i] = population[i]
+        mejora = fitness < pBestScore
+        pBestScore[mejora] = fitness[mejora]
+        pBest[mejora] = population[mejora]
 
     # Encontrar el mejor fitness y solución
     bestIndex = np.argmin(fitness)
@@ -1,10 +1,11 @@
 import numpy as np
 
 from Discretization import discretization as b
+from Problem.packed import DTYPE_BINARIO
 from Metaheuristics.imports import metaheuristics, MH_ARG_MAP # Assuming MH_ARG_MAP also applies to KP or will be adapted
 
 
-def initialize_population(mh, pop, instance):
+def initialize_population(mh, pop, instance, init = 'random', alpha = 0.3):
 
     vel, pBestScore, pBest = None, None, None
     
@@ -13,8 +14,12 @@ def initialize_population(mh, pop, instance):
         pBestScore = np.full(pop, float("inf"))  # Más directo
         pBest = np.zeros((pop, instance.getItems()))
     
-    # Genero una población inicial binaria, esto ya que nuestro problema es binario
-    population = np.random.randint(low = 0, high = 2, size = (pop, instance.getItems()))
+    # With init:grasp the population starts feasible, built by a randomized greedy
+    if init == 'grasp':
+        population = instance.grasp_population(pop, alpha)
+    else:
+        # Genero una población inicial binaria, esto ya que nuestro problema es binario
+        population = np.random.randint(low = 0, high = 2, size = (pop, instance.getItems()), dtype = DTYPE_BINARIO)
     
     return population, vel, pBestScore, pBest
 
@@ -22,18 +27,13 @@ def evaluate_population(mh, population, fitness, instance, pBest, pBestScore):
     """
     Evaluates the initial population for KP, checking feasibility and calculating fitness.
     """
-    # Calculate feasibility and initial fitness for each individual
-    for i in range(population.__len__()):
-        flag = instance.factibilityTest(population[i])
-        if not flag:  # infeasible solution
-            population[i] = instance.repair(population[i])
-
-        fitness[i] = instance.fitness(population[i])
+    # Calculate feasibility, repair and initial fitness of the whole population
+    population, fitness[:] = instance.evaluate_batch(population)
 
-        if mh == 'PSO':
-            if pBestScore[i] > fitness[i]:
-                pBestScore[i] = fitness[i]
-                pBest[i, :] = population[i, :].copy()
+    if mh == 'PSO':
+        mejoras = pBestScore > fitness
+        pBestScore[mejoras] = fitness[mejoras]
+        pBest[mejoras, :] = population[mejoras, :]
 
     # For maximization problems (like KP), sort in descending order
     solutionsRanking = np.argsort(fitness)[::-1]  # rankings of the best fitnesses (descending)
@@ -47,7 +47,7 @@ def evaluate_population(mh, population, fitness, instance, pBest, pBestScore):
 
 
 def iterate_population_kp(mh, population, iter, maxIter, instance, fitness, best, 
-                           vel=None, pBest=None, fo=None, param=None):
+                           vel=None, pBest=None, fo=None, param=None, dtype=np.float64):
     """
     Iterates over the population for KP using the specified metaheuristic ('mh'),
     constructing arguments dynamically based on MH_ARG_MAP.
@@ -57,6 +57,11 @@ def iterate_population_kp(mh, population, iter, maxIter, instance, fitness, best
     # --- Manejo especial para PO ---
     if mh == 'PO':
         return np.array(population), vel, None
+
+    # The MHs work in the continuous space (float64, or float32 with precision:float32); the
+    # binary (uint8) population is converted so in-place updates do not truncate
+    population = np.asarray(population, dtype = dtype)
+    best = np.asarray(best, dtype = dtype)
     
     # --- Manejo especial para GA ---
     if mh == 'GA':
@@ -81,8 +86,8 @@ def iterate_population_kp(mh, population, iter, maxIter, instance, fitness, best
     dim = instance.getItems()
     lb0_val = 0
     ub0_val = 1
-    lb_arr = np.zeros(dim)
-    ub_arr = np.ones(dim)
+    lb_arr = np.zeros(dim, dtype = dtype)
+    ub_arr = np.ones(dim, dtype = dtype)
     
     context = {
         'maxIter': maxIter,
@@ -145,6 +150,9 @@ def binarize_and_evaluate(mh, population, fitness, DS, best, matrixBin, instance
     """
     Binarizes (if not GA), checks feasibility, and calculates fitness for each individual in KP.
     """
+    # Binarized individuals go to a separate uint8 population (the continuous one stays float)
+    binaria = np.asarray(population, dtype = DTYPE_BINARIO) if mh == "GA" else np.empty(population.shape, dtype = DTYPE_BINARIO)
+
     for i in range(population.__len__()):
         # The original solverKP had a commented-out binarization line.
         # If binarization is generally applied, uncomment and ensure DS is correctly handled.
@@ -153,20 +161,19 @@ def binarize_and_evaluate(mh, population, fitness, DS, best, matrixBin, instance
         # values are being worked with directly by the MH and then implicitly converted.
         # If a explicit binarization step is needed AFTER the MH update and BEFORE fitness evaluation:
         if mh != "GA":
-           population[i] = b.aplicarBinarizacion(population[i], DS, best, matrixBin[i])
-        
-        flag = instance.factibilityTest(population[i])
+           binaria[i] = b.aplicarBinarizacion(population[i], DS, best, matrixBin[i])
 
-        if not flag:  # infeasible solution
-            population[i] = instance.repair(population[i])
+    population = binaria
 
-        fitness[i] = instance.fitness(population[i])
+    # Feasibility, repair and fitness of the whole population (uses the fitness cache if enabled)
+    population, fitness[:] = instance.evaluate_batch(population)
+
+    if mh == 'PSO':
+        mejoras = fitness < pBestScore
+        pBest[mejoras] = population[mejoras]
 
-        if mh == 'PSO':
-            if fitness[i] < pBestScore[i]:
-                pBest[i] = np.copy(population[i])
-                
-        '''if mh == 'LOA':
+    '''if mh == 'LOA':
+        for i in range(population.__len__()):
             _, fitn = fo(posibles_mejoras[i])
             
             if fitn < fitness[i]:
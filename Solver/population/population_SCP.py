@@ -1,9 +1,10 @@
 import numpy as np
 
 from Discretization import discretization as b
+from Problem.packed import DTYPE_BINARIO
 from Metaheuristics.imports import metaheuristics, MH_ARG_MAP
 
-def initialize_population(mh, pop, instance):
+def initialize_population(mh, pop, instance, init = 'random', alpha = 0.3):
     vel, pBestScore, pBest = None, None, None
     
     if mh == 'PSO':
@@ -11,25 +12,23 @@ def initialize_population(mh, pop, instance):
         pBestScore = np.full(pop, float("inf"))  # Más directo
         pBest = np.zeros((pop, instance.getColumns()))
     
-    # Genero una población inicial binaria, esto ya que nuestro problema es binario
-    population = np.random.randint(low = 0, high = 2, size = (pop, instance.getColumns()))
+    # Con init:grasp la población parte factible, construida con greedy aleatorizado
+    if init == 'grasp':
+        population = instance.grasp_population(pop, alpha)
+    else:
+        # Genero una población inicial binaria, esto ya que nuestro problema es binario
+        population = np.random.randint(low = 0, high = 2, size = (pop, instance.getColumns()), dtype = DTYPE_BINARIO)
     
     return population, vel, pBestScore, pBest
 
 def evaluate_population(mh, population, fitness, instance, pBest, pBestScore, repairType):
-    # Calculo de factibilidad de cada individuo y calculo del fitness inicial
-    for i in range(population.__len__()):
-        flag, _ = instance.factibilityTest(population[i])
-        
-        if not flag: #solucion infactible
-            population[i] = instance.repair(population[i], repairType)
-            
-        fitness[i] = instance.fitness(population[i])
-        
-        if mh == 'PSO':
-            if pBestScore[i] > fitness[i]:
-                pBestScore[i] = fitness[i]
-                pBest[i, :] = population[i, :].copy()
+    # Factibilidad, reparación y fitness inicial de toda la población a la vez
+    population, fitness[:] = instance.evaluate_batch(population, repairType)
+    
+    if mh == 'PSO':
+        mejoras = pBestScore > fitness
+        pBestScore[mejoras] = fitness[mejoras]
+        pBest[mejoras, :] = population[mejoras, :]
         
     solutionsRanking = np.argsort(fitness) # rankings de los mejores fitnes
     bestRowAux = solutionsRanking[0] # DETERMINO MI MEJOR SOLUCION Y LA GUARDO 
@@ -39,7 +38,7 @@ def evaluate_population(mh, population, fitness, instance, pBest, pBestScore, re
     return fitness, best, bestFitness, pBest, pBestScore
 
 def iterate_population_scp(mh, population, iter, maxIter, instance, fitness, best,
-                           vel=None, pBest=None, fo=None, param=None):
+                           vel=None, pBest=None, fo=None, param=None, dtype=np.float64):
     """
     Itera sobre la población para SCP usando la metaheurística especificada ('mh'),
     construyendo los argumentos dinámicamente basados en MH_ARG_MAP.
@@ -49,6 +48,11 @@ def iterate_population_scp(mh, population, iter, maxIter, instance, fitness, bes
     if mh == 'PO':
         return np.array(population), vel, None
 
+    # Las MH trabajan en el espacio continuo (float64, o float32 con precision:float32); la
+    # población binaria (uint8) se convierte para que las operaciones en el lugar no trunquen
+    population = np.asarray(population, dtype = dtype)
+    best = np.asarray(best, dtype = dtype)
+
     # --- Manejo especial para GA ---
     if mh == 'GA':
         if param is None:
@@ -74,8 +78,8 @@ def iterate_population_scp(mh, population, iter, maxIter, instance, fitness, bes
     lb0_val = 0
     ub0_val = 1
     dim = instance.getColumns()
-    lb_arr = np.zeros(dim)
-    ub_arr = np.ones(dim)
+    lb_arr = np.zeros(dim, dtype = dtype)
+    ub_arr = np.ones(dim, dtype = dtype)
 
     context = {
         'maxIter': maxIter,
@@ -136,28 +140,32 @@ def iterate_population_scp(mh, population, iter, maxIter, instance, fitness, bes
     return new_population, new_vel, posibles_mejoras
 
 def binarize_and_evaluate(mh, population, fitness, DS, best, matrixBin, instance, repairType, pBest, pBestScore, posibles_mejoras, fo):
-    # Binarizo, calculo de factibilidad de cada individuo y calculo del fitness
-    for i in range(population.__len__()):
+    # Binarizo cada individuo en una población uint8 aparte (la continua queda en float)
+    if mh != "GA":
+        binaria = np.empty(population.shape, dtype = DTYPE_BINARIO)
+        
+        for i in range(population.__len__()):
+            binaria[i] = b.aplicarBinarizacion(population[i], DS, best, matrixBin[i])
+        
+        population = binaria
+    else:
+        population = np.asarray(population, dtype = DTYPE_BINARIO)
 
-        if mh != "GA":
-            population[i] = b.aplicarBinarizacion(population[i], DS, best, matrixBin[i])
+    # Factibilidad, reparación y fitness de toda la población a la vez
+    population, fitness[:] = instance.evaluate_batch(population, repairType)
 
-        flag, _ = instance.factibilityTest(population[i])
+    if mh == 'PSO':
+        mejoras = fitness < pBestScore
+        pBest[mejoras] = population[mejoras]
         
-        if not flag: #solucion infactible
-            population[i] = instance.repair(population[i], repairType)
-            
-        fitness[i] = instance.fitness(population[i])
-
-        if mh == 'PSO':
-            if fitness[i] < pBestScore[i]:
-                pBest[i] = np.copy(population[i])
-                
-        if mh == 'LOA':
-            _, fitn = fo(posibles_mejoras[i])
+    if mh == 'LOA':
+        for i in range(population.__len__()):
+            solution, fitn = fo(posibles_mejoras[i])
             
+            # Se guarda la mejora ya binarizada y reparada, la población es binaria (uint8)
             if fitn < fitness[i]:
-                population[i] = posibles_mejoras[i]
+                population[i] = solution
+                fitness[i] = fitn
     
     return population, fitness, pBest
 
@@ -5,7 +5,7 @@ import json
 
 from Diversity.Codes.diversity import initialize_diversity, calculate_diversity
 from Metaheuristics.imports import IterarPO
-from Problem.Benchmark.Problem import fitness as f
+from Problem.Benchmark.registry import obtenerBenchmark, precargarCEC
 
 from Solver.population.population_BEN import initialize_population, evaluate_population, update_population, iterate_population
 from Util.log import initial_log, log_progress, final_log
@@ -26,6 +26,9 @@ def solverBEN(id, mh, maxIter, pop, function, lb, ub, dim):
     if not isinstance(ub, list):
         ub = [ub] * dim
     
+    # Las funciones CEC se construyen antes de medir tiempos (una vez por proceso)
+    precargarCEC(function, dim)
+    
     initialTime = time.time()
     optimo = bd.obtenerOptimoInstancia(function)[0][0]
     
@@ -34,9 +37,12 @@ def solverBEN(id, mh, maxIter, pop, function, lb, ub, dim):
     
     initializationTime1 = time.time()
     
+    # Función ya resuelta en el registro: evaluar no busca el nombre en cada llamada
+    benchmark = obtenerBenchmark(function)
+    
     def fo_vectorized(x):
         x = np.clip(x, lb, ub)
-        return x, float(f(function, x))
+        return x, float(benchmark.evaluar(x))
     
     population, vel, pBestScore, pBest = initialize_population(mh, pop, dim, lb, ub)
     
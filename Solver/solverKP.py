@@ -2,12 +2,15 @@ import numpy as np
 import os
 import time
 
-from Problem.KP.problem import KP
+from Problem.KP.problem import KP, DP_MEGABYTES, gapKP
+from Problem.SCP.lagrangian import gapObjetivo
+from Problem.fitness_cache import FitnessCache, megabytesCache
+from Problem.packed import PackedPopulation, dtypeContinuo
 from Metaheuristics.imports import IterarPO
 from Diversity.imports import diversidadHussain,porcentajesXLPXPT
 from Discretization import discretization as b # Still needed for binarization within the loop if not handled by MH
 from Util.util import convert_into_binary
-from Util.log import initial_log, log_progress, final_log_kp
+from Util.log import initial_log, log_progress, final_log_kp, log_reduccion_kp
 from BD.sqlite import BD
 
 # Import functions from the new population_kp.py
@@ -19,11 +22,37 @@ from Solver.population.population_KP import (
     iterate_population_kp
 )
 
-def solverKP(id, mh, maxIter, pop, instancia, DS, param):
+def solverKP(id, mh, maxIter, pop, instancia, DS, param, opciones=None):
     
     dirResult = './Resultados/'
     instance = KP(instancia)
     
+    # Optional experiment parameters (e.g. cache:<MB>)
+    opciones = opciones or {}
+    
+    # Optional core-problem reduction (reduce:true): the MHs only search the core items
+    if opciones.get("reduce", "false") == "true" and instance.reduceInstance():
+        log_reduccion_kp(instance.getReductionStats())
+    
+    # dtype of the continuous MH population (precision:float32); the binary one is always uint8
+    dtipoContinuo = dtypeContinuo(opciones)
+    
+    # LRU cache of repaired solutions and their fitness
+    if megabytesCache(opciones) > 0:
+        instance.setFitnessCache(FitnessCache(megabytesCache(opciones)))
+    
+    # Upper bound to report the gap (cota:true) and stop once it is reached (stop:gap<=x). The
+    # exact optimum is used when the dynamic-programming table fits in dp:<MB>
+    gapMaximo = gapObjetivo(opciones)
+    cota = None
+
+    if gapMaximo is not None or opciones.get("cota", "false") == "true":
+        cota = instance.upperBound(float(opciones.get("dp", DP_MEGABYTES)))
+
+        # Instances outside orden_kp take the optimum from the exact solver when it ran
+        if instance.getOptimum() is None and instance.isBoundExact():
+            instance.setOptimum(cota)
+
     # chaotic_map is not used in the new binarize_and_evaluate for KP, so can be removed or kept if planned for future use
     chaotic_map = None 
     
@@ -34,13 +63,15 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
 
     results = open(dirResult+mh+"_"+instancia.split(".")[0]+"_"+str(id)+".csv", "w")
     results.write(
-        f'iter,fitness,time,XPL,XPT,DIV\n'
+        f'iter,fitness,time,XPL,XPT,DIV,EVAL\n'
     )
     
     # Initialize the population using the new function
-    population, vel, pBestScore, pBest = initialize_population(mh, pop, instance)
+    # init:grasp builds a feasible population, rcl:<alpha> sets the randomization width
+    population, vel, pBestScore, pBest = initialize_population(
+        mh, pop, instance, opciones.get("init", "random"), float(opciones.get("rcl", 0.3)))
     
-    maxDiversity = diversidadHussain(population)
+    maxDiversity = diversidadHussain(PackedPopulation.pack(population))
     XPL, XPT, state = porcentajesXLPXPT(maxDiversity, maxDiversity)
     
     # Initialize fitness array
@@ -50,7 +81,7 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
     fitness, best, bestFitness, pBest, pBestScore = evaluate_population(
         mh, population, fitness, instance, pBest, pBestScore)
     
-    matrixBin = population.copy() # matrixBin still needed for binarization
+    matrixBin = PackedPopulation.pack(population) # binary population kept packed, 64 items per word
     
     i = population.__len__() - 1
 
@@ -72,25 +103,36 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
         f'0,{str(bestFitness)},{str(round(initializationTime2-initializationTime1,3))},{str(XPL)},{str(XPT)},{maxDiversity}\n'
     )'''
     
+    gap = gapKP(bestFitness, cota) if cota is not None else None
+
     initial_log(instancia, instance.getItems(), mh, bestFitness, instance.getOptimum(), 
                 initializationTime1, initializationTime2, XPT,
-                XPL, maxDiversity, results)
+                XPL, maxDiversity, results, instance.getEvaluations(), gap)
     
     def fo(x):
         x = b.aplicarBinarizacion(x, DS, best, matrixBin[i]) # 'i' is still an issue here outside the loop
-        x = instance.repair(x)
-        return x, instance.fitness(x)
+        x, fitness = instance.evaluate(x)
+
+        # The repaired solution is uint8: the MHs (e.g. PO) flip its sign
+        return x.astype(dtipoContinuo), fitness
 
     if mh == 'PO':
         iterarPO = IterarPO(fo, instance.getItems(), pop, maxIter, 0, 1)
 
     for iter in range(1, maxIter + 1):
+        # The incumbent is already within the requested gap of the upper bound
+        if gapMaximo is not None and gap <= gapMaximo:
+            break
+
         # Get iteration start time
         timerStart = time.time()
         
+        # Distinct evaluations (repair + fitness) performed during the iteration
+        evaluaciones = instance.getEvaluations()
+        
         if mh == 'PO':
             # 'population' no fue modificada por iterate_population_scp en este caso
-            iterarPO.pob(population, iter)
+            iterarPO.pob(population.astype(dtipoContinuo), iter)
             population = iterarPO.optimizer(iter)
             if not isinstance(population, np.ndarray):
                 population = np.array(population)
@@ -110,6 +152,7 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
             pBest=pBest, # Will be None unless PSO is integrated to use it
             fo=fo,       # Pass the objective function
             param=param,
+            dtype=dtipoContinuo,
         )
         
         population, fitness, pBest = binarize_and_evaluate(
@@ -119,10 +162,10 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
         best, bestFitness = update_best_solution(population, fitness, best, bestFitness)
         
         # Update matrixBin for the next iteration's binarization if needed
-        matrixBin = population.copy()
+        matrixBin = PackedPopulation.pack(population)
 
-        # Calculate diversity
-        div_t = diversidadHussain(population)
+        # Calculate diversity from the column sums of the packed population
+        div_t = diversidadHussain(matrixBin)
         
         if maxDiversity < div_t:
             maxDiversity = div_t
@@ -147,18 +190,24 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
             f'{iter+1},{str(bestFitness)},{str(round(timeEjecuted,3))},{str(XPL)},{str(XPT)},{str(div_t)}\n'
         )'''
         
-        log_progress(iter, maxIter, bestFitness, optimo, timerFinal - timerStart, XPT, XPL, div_t, results)
+        gap = gapKP(bestFitness, cota) if cota is not None else None
+
+        log_progress(iter, maxIter, bestFitness, optimo, timerFinal - timerStart, XPT, XPL, div_t, results,
+                     instance.getEvaluations() - evaluaciones, gap)
         
     '''print("------------------------------------------------------------------------------------------------------")
     print("best fitness: "+str(bestFitness))
-    print("Cantidad de columnas seleccionadas: "+str(sum(best))) # For KP, this would be "Number of items selected"
+    print("Cantidad de columnas seleccionadas: "+str(int(np.count_nonzero(best)))) # For KP, this would be "Number of items selected"
     print("------------------------------------------------------------------------------------------------------")'''
     
     finalTime = time.time()
     timeExecution = finalTime - initialTime
     #print("Tiempo de ejecucion (s): "+str(timeExecution))
     
-    final_log_kp(bestFitness, str(sum(best)), initialTime, finalTime)
+    # The best solution is stored over the items of the original instance
+    best = instance.liftSolution(best)
+    
+    final_log_kp(bestFitness, str(int(np.count_nonzero(best))), initialTime, finalTime, cota, gap)
     
     results.close()
     
@@ -169,6 +218,16 @@ def solverKP(id, mh, maxIter, pop, instancia, DS, param):
     bd = BD()
     bd.insertarIteraciones(fileName, binary, id)
     bd.insertarResultados(bestFitness, timeExecution, best, id)
+    
+    if instance.getFitnessCache() is not None:
+        bd.insertarEstadisticas(instance.getFitnessCache().getStats(), id)
+
+    if instance.isReduced():
+        bd.insertarEstadisticas(instance.getReductionStats(), id)
+
+    if cota is not None:
+        bd.insertarEstadisticas({**instance.getBoundStats(), 'gap_final': gap}, id)
+        
     bd.actualizarExperimento(id, 'terminado')
     
     os.remove(dirResult + mh + "_" + instancia.split(".")[0] + "_" + str(id) + ".csv")
\ No newline at end of file
@@ -4,6 +4,10 @@ import time
 
 from Problem.SCP.problem import SCP
 from Problem.USCP.problem import USCP
+from Problem.fitness_cache import FitnessCache, megabytesCache
+from Problem.packed import PackedPopulation, dtypeContinuo
+from Problem.SCP.blocks import megabytesBloque
+from Problem.SCP.lagrangian import gapObjetivo, calcularGap
 from Metaheuristics.imports import IterarPO
 from Diversity.Codes.diversity import initialize_diversity, calculate_diversity
 from Discretization import discretization as b
@@ -12,30 +16,61 @@ from Solver.population.population_SCP import (initialize_population, evaluate_po
                                 update_best_solution, iterate_population_scp)
 
 from BD.sqlite import BD
-from Util.log import initial_log_scp_uscp, log_progress, final_log_scp
+from Util.log import initial_log_scp_uscp, log_progress, final_log_scp, log_reduccion
 
-def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost):
+def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost, opciones=None):
     
     bd = BD()
     
     dirResult = './Resultados/Transitorio/'
     
+    # Parámetros opcionales del experimento (ej: matrix:dense)
+    opciones = opciones or {}
+    
+    # Por defecto la matriz de cobertura se almacena dispersa (CSR + CSC)
+    sparse = opciones.get("matrix", "sparse") != "dense"
+    
     if unicost:
-        instance = USCP(instances)
+        instance = USCP(instances, sparse)
     else:
-        instance = SCP(instances)
+        instance = SCP(instances, sparse)
+    
+    # Memoria máxima por bloque de los productos con la matriz de cobertura (memoria:<MB>)
+    instance.setBlockMemory(megabytesBloque(opciones))
+    
+    # Reducción opcional de la instancia (reduce:true): las MH trabajan sobre las columnas que quedan
+    if opciones.get("reduce", "false") == "true" and instance.reduceInstance():
+        log_reduccion(instance.getReductionStats())
+    
+    # Tipo de la población continua de las MH (precision:float32); la binaria es siempre uint8
+    dtipoContinuo = dtypeContinuo(opciones)
+    
+    # Poda de columnas redundantes por costo descendente tras cada reparación (prune:true)
+    instance.setPrune(opciones.get("prune", "false") == "true")
+    
+    # Caché LRU de soluciones reparadas y su fitness (cache:<MB>)
+    if megabytesCache(opciones) > 0:
+        instance.setFitnessCache(FitnessCache(megabytesCache(opciones)))
+    
+    # Cota inferior lagrangiana para reportar el gap (cota:true) y terminar al alcanzarlo (stop:gap<=x)
+    gapMaximo = gapObjetivo(opciones)
+    cota = None
+    
+    if gapMaximo is not None or opciones.get("cota", "false") == "true":
+        cota = instance.lowerBound()
     
     # tomo el tiempo inicial de la ejecucion
     initialTime = time.time()
     initializationTime1 = time.time()
     
     results = open(dirResult + mh + "_" + instances.split(".")[0] + "_" + str(id) + ".csv", "w")
-    results.write(f'iter,fitness,time,XPL,XPT,DIV\n')
+    results.write(f'iter,fitness,time,XPL,XPT,DIV,EVAL\n')
     
-    # Inicializo la población
-    population, vel, pBestScore, pBest = initialize_population(mh, pop, instance)
+    # Inicializo la población (init:grasp construye una población factible con ancho de lista rcl:<alpha>)
+    population, vel, pBestScore, pBest = initialize_population(
+        mh, pop, instance, opciones.get("init", "random"), float(opciones.get("rcl", 0.3)))
     
-    maxDiversity, XPL, XPT = initialize_diversity(population)
+    maxDiversity, XPL, XPT = initialize_diversity(PackedPopulation.pack(population))
     
     # Genero un vector donde almacenaré los fitness de cada individuo
     fitness = np.zeros(pop)
@@ -44,35 +79,47 @@ def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost):
     fitness, best, bestFitness, pBest, pBestScore = evaluate_population(
         mh, population, fitness, instance, pBest, pBestScore, repairType)
     
-    matrixBin = population.copy()
+    # La población binaria de la iteración anterior se guarda empaquetada (64 variables por palabra)
+    matrixBin = PackedPopulation.pack(population)
     
     i = population.__len__() - 1
     
     initializationTime2 = time.time()
     
-    initial_log_scp_uscp(instance, DS, bestFitness, instances, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results)
+    gap = calcularGap(bestFitness, cota) if cota is not None else None
+    
+    initial_log_scp_uscp(instance, DS, bestFitness, instances, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results,
+                         instance.getEvaluations(), gap)
     
     posibles_mejoras = None
     
     # Función objetivo para GOA, HBA, TDO, SHO y SBOA
     def fo(x):
         x = b.aplicarBinarizacion(x, DS, best, matrixBin[i])
-        x = instance.repair(x, repairType) # Reparación de soluciones
+        x, fitness = instance.evaluate(x, repairType)
         
-        return x, instance.fitness(x) # Return de la solución reparada y valor de función objetivo
+        # La solución reparada es uint8: las MH (p. ej. PO) operan sobre ella con signo
+        return x.astype(dtipoContinuo), fitness # Return de la solución reparada y valor de función objetivo
     
     if mh == 'PO':
         iterarPO = IterarPO(fo, instance.getColumns(), pop, maxIter, 0, 1)
         
     for iter in range(1, maxIter + 1):
+        # La mejor solución ya está dentro del gap pedido respecto de la cota: no se puede mejorar lo suficiente
+        if gapMaximo is not None and gap <= gapMaximo:
+            break
+        
         # obtengo mi tiempo inicial
         timerStart = time.time()
         
+        # Evaluaciones (reparación + fitness) de individuos distintos realizadas en la iteración
+        evaluaciones = instance.getEvaluations()
+        
         # --- Manejo especial para PO (se mantiene fuera de iterate_population_scp) ---
         
         if mh == 'PO':
             # 'population' no fue modificada por iterate_population_scp en este caso
-            iterarPO.pob(population, iter)
+            iterarPO.pob(population.astype(dtipoContinuo), iter)
             population = iterarPO.optimizer(iter)
             if not isinstance(population, np.ndarray):
                 population = np.array(population)
@@ -90,7 +137,8 @@ def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost):
             vel=vel,
             pBest=pBest,
             fo=fo,
-            param=param
+            param=param,
+            dtype=dtipoContinuo
         )
         
         # Binarizo, calculo de factibilidad de cada individuo y calculo del fitness
@@ -101,23 +149,29 @@ def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost):
         # Actualizo mi mejor solucion
         best, bestFitness = update_best_solution(population, fitness, best, bestFitness)
         
-        matrixBin = population.copy()
+        matrixBin = PackedPopulation.pack(population)
 
-        # Calculo de diversidad
-        div_t, maxDiversity, XPL, XPT = calculate_diversity(population, maxDiversity)
+        # Calculo de diversidad (con las sumas por columna de la población empaquetada)
+        div_t, maxDiversity, XPL, XPT = calculate_diversity(matrixBin, maxDiversity)
 
         timerFinal = time.time()
         
         # calculo mi tiempo para la iteracion t
         timeExecuted = timerFinal - timerStart
         
-        log_progress(iter, maxIter, bestFitness, instance.getOptimum(), timeExecuted, XPT, XPL, div_t, results)
+        gap = calcularGap(bestFitness, cota) if cota is not None else None
+        
+        log_progress(iter, maxIter, bestFitness, instance.getOptimum(), timeExecuted, XPT, XPL, div_t, results,
+                     instance.getEvaluations() - evaluaciones, gap)
         
     finalTime = time.time()
     
-    numberOfSubsets = str(sum(best))
+    # La mejor solución se guarda en las columnas de la instancia original
+    best = instance.liftSolution(best)
     
-    final_log_scp(bestFitness, numberOfSubsets, initialTime, finalTime)
+    numberOfSubsets = str(int(np.count_nonzero(best)))
+    
+    final_log_scp(bestFitness, numberOfSubsets, initialTime, finalTime, cota, gap)
     
     results.close()
     
@@ -127,6 +181,19 @@ def solverSCP(id, mh, maxIter, pop, instances, DS, repairType, param, unicost):
 
     bd.insertarIteraciones(fileName, binary, id)
     bd.insertarResultados(bestFitness, finalTime - initialTime, best, id)
+    
+    if instance.isReduced():
+        bd.insertarEstadisticas(instance.getReductionStats(), id)
+    
+    if instance.getFitnessCache() is not None:
+        bd.insertarEstadisticas(instance.getFitnessCache().getStats(), id)
+    
+    if cota is not None:
+        bd.insertarEstadisticas({**instance.getBoundStats(), 'gap_final': gap}, id)
+    
+    if opciones.get("prune", "false") == "true":
+        bd.insertarEstadisticas(instance.getPruneStats(), id)
+        
     bd.actualizarExperimento(id, 'terminado')
     
     os.remove(dirResult + mh + "_" + instances.split(".")[0] + "_" + str(id) + ".csv")
\ No newline at end of file
@@ -15,7 +15,16 @@ def obtener_fecha_hora():
 
     return formatted_time
 
-def log_message(iter, bestFitness, optimo, timeEjecuted, XPT, XPL, div_t, results):
+def linea_resultados(iter, bestFitness, timeEjecuted, XPT, XPL, div_t, evaluaciones):
+    # Fila del CSV de resultados; la columna EVAL (evaluaciones distintas) solo existe en SCP/USCP/KP
+    linea = f"{iter},{bestFitness:.2e},{round(timeEjecuted, 3)},{XPL},{XPT},{div_t}"
+    
+    if evaluaciones is not None:
+        linea += f",{evaluaciones}"
+        
+    return linea + "\n"
+
+def log_message(iter, bestFitness, optimo, timeEjecuted, XPT, XPL, div_t, results, evaluaciones=None, gap=None):
     msg = (
         f"Iteración: {iter:<4} | "
         f"Mejor Fitness: {bestFitness:>7.2e} | "
@@ -25,18 +34,26 @@ def log_message(iter, bestFitness, optimo, timeEjecuted, XPT, XPL, div_t, result
         f"XPL: {XPL:>6.2f} | "
         f"DIV: {div_t:>5.2f}"
     )
+    
+    if evaluaciones is not None:
+        msg += f" | EVAL: {evaluaciones:>4}"
+    
+    # Gap (%) respecto de la cota inferior, cuando la instancia la calcula
+    if gap is not None:
+        msg += f" | GAP: {gap:>6.2f}%"
+        
     print(msg)
     
     if results:
         try:
-            results.write(f"{iter},{bestFitness:.2e},{round(timeEjecuted, 3)},{XPL},{XPT},{div_t}\n")
+            results.write(linea_resultados(iter, bestFitness, timeEjecuted, XPT, XPL, div_t, evaluaciones))
         except Exception as e:
             print(f"Error al escribir en el archivo de resultados: {e}")
 
-def log_progress(iter, maxIter, bestFitness, optimo, timeEjecuted, XPT, XPL, div_t, results):
+def log_progress(iter, maxIter, bestFitness, optimo, timeEjecuted, XPT, XPL, div_t, results, evaluaciones=None, gap=None):
     # Siempre escribir en el archivo
     try:
-        results.write(f"{iter},{bestFitness:.2e},{round(timeEjecuted, 3)},{XPL},{XPT},{div_t}\n")
+        results.write(linea_resultados(iter, bestFitness, timeEjecuted, XPT, XPL, div_t, evaluaciones))
     except Exception as e:
         print(f"Error al escribir en el archivo de resultados: {e}")
 
@@ -51,17 +68,40 @@ def log_progress(iter, maxIter, bestFitness, optimo, timeEjecuted, XPT, XPL, div
             f"XPL: {XPL:>6.2f} | "
             f"DIV: {div_t:>5.2f}"
         )
+        
+        if evaluaciones is not None:
+            msg += f" | EVAL: {evaluaciones:>4}"
+        
+        if gap is not None:
+            msg += f" | GAP: {gap:>6.2f}%"
+            
         print(msg)
 
-def initial_log(function, dim, mh, bestFitness, optimo, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results):
+def initial_log(function, dim, mh, bestFitness, optimo, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results, evaluaciones=None, gap=None):
     print(f"{function} - {dim} - {mh} - Best Fitness Inicial: {bestFitness:.2e}")
     print("------------------------------------------------------------------------------------------------------")
-    log_message(0, bestFitness, optimo, initializationTime2 - initializationTime1, XPT, XPL, maxDiversity, results)
+    log_message(0, bestFitness, optimo, initializationTime2 - initializationTime1, XPT, XPL, maxDiversity, results, evaluaciones, gap)
 
-def initial_log_scp_uscp(instance, DS, bestFitness, instances, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results):
+def initial_log_scp_uscp(instance, DS, bestFitness, instances, initializationTime1, initializationTime2, XPT, XPL, maxDiversity, results, evaluaciones=None, gap=None):
     print(f"{instances} - {DS} - {instance.getBlockSizes()} - Best Fitness Inicial: {bestFitness:.2e}")
     print("------------------------------------------------------------------------------------------------------")
-    log_message(0, bestFitness, instance.getOptimum(), initializationTime2 - initializationTime1, XPT, XPL, maxDiversity, results)
+    log_message(0, bestFitness, instance.getOptimum(), initializationTime2 - initializationTime1, XPT, XPL, maxDiversity, results, evaluaciones, gap)
+
+def log_reduccion(estadisticas):
+    print(
+        f"Reducción: filas {estadisticas['filas_originales']} -> {estadisticas['filas_reducidas']} | "
+        f"columnas {estadisticas['columnas_originales']} -> {estadisticas['columnas_reducidas']} | "
+        f"fijas: {estadisticas['columnas_fijas']} (costo {estadisticas['costo_fijo']:g}) | "
+        f"Tiempo (s): {estadisticas['tiempo_reduccion']:.3f}"
+    )
+
+def log_reduccion_kp(estadisticas):
+    print(
+        f"Reducción: objetos {estadisticas['objetos_originales']} -> {estadisticas['objetos_reducidos']} | "
+        f"fijos dentro: {estadisticas['objetos_fijos_dentro']} (beneficio {estadisticas['beneficio_fijo']:g}) | "
+        f"fijos fuera: {estadisticas['objetos_fijos_fuera']} | "
+        f"Tiempo (s): {estadisticas['tiempo_reduccion']:.3f}"
+    )
 
 def final_log(bestFitness, initialTime, finalTime):
     print("------------------------------------------------------------------------------------------------------")
@@ -69,18 +109,24 @@ def final_log(bestFitness, initialTime, finalTime):
     print(f"{Fore.GREEN}Best Fitness: {bestFitness:.2e}")
     print("------------------------------------------------------------------------------------------------------")
         
-def final_log_scp(bestFitness, subsSelected, initialTime, finalTime):
+def final_log_scp(bestFitness, subsSelected, initialTime, finalTime, cota=None, gap=None):
     print("------------------------------------------------------------------------------------------------------")
     print(f"{Fore.GREEN}Tiempo de ejecución (s): {(finalTime - initialTime):.2f}")
     print(f"{Fore.GREEN}Best Fitness: {bestFitness:.2e} ({bestFitness})")
     print(f"{Fore.GREEN}Subconjuntos seleccionados: {subsSelected}")
+    
+    if cota is not None:
+        print(f"{Fore.GREEN}Cota inferior: {cota:g} | Gap: {gap:.2f}%")
     print("------------------------------------------------------------------------------------------------------")
     
-def final_log_kp(bestFitness, itemsSelected, initialTime, finalTime):
+def final_log_kp(bestFitness, itemsSelected, initialTime, finalTime, cota=None, gap=None):
     print("------------------------------------------------------------------------------------------------------")
     print(f"{Fore.GREEN}Tiempo de ejecución (s): {(finalTime - initialTime):.2f}")
     print(f"{Fore.GREEN}Best Fitness: {bestFitness:.2e} ({bestFitness})")
     print(f"{Fore.GREEN}Cantidad de objetos seleccionados: {itemsSelected}")
+    
+    if cota is not None:
+        print(f"{Fore.GREEN}Cota superior: {cota:g} | Gap: {gap:.2f}%")
     print("------------------------------------------------------------------------------------------------------")
 
 def log_experimento(data):
@@ -0,0 +1,71 @@
+import time
+import argparse
+import numpy as np
+
+from Problem.SCP.problem import SCP
+from Problem.USCP.problem import USCP
+from Problem.packed import PackedPopulation, DTYPE_BINARIO
+
+# Compara el camino binario de SCP/USCP con los tipos anteriores (población int64, matriz int32,
+# coberturas int64) y con los compactos (población uint8, coberturas int16/int32, población
+# empaquetada): memoria de cada arreglo y tiempo del producto de cobertura y de la reparación.
+
+INSTANCIAS = ['scpnrh1', 'scpnrg1', 'uscpclr13', 'uscpcyc10', 'uscpcyc11']
+
+def cargar(nombre):
+    return USCP(nombre) if nombre.startswith('uscp') else SCP(nombre)
+
+def cronometrar(funcion, repeticiones):
+    funcion()
+    inicio = time.perf_counter()
+
+    for _ in range(repeticiones):
+        funcion()
+
+    return (time.perf_counter() - inicio) / repeticiones
+
+def megabytes(nbytes):
+    return nbytes / (1024 * 1024)
+
+def comparar(nombre, individuos, repeticiones, repairType):
+    instance = cargar(nombre)
+    csr = instance.getCoverangeCSR()
+    compacta = np.random.randint(low = 0, high = 2, size = (individuos, instance.getColumns()), dtype = DTYPE_BINARIO)
+    anterior = compacta.astype(np.int64)
+    csrAnterior = csr.astype(np.int32)
+
+    coberturaAnterior = np.asarray(csrAnterior @ anterior.T).T.astype(np.int64)
+    coberturaCompacta = np.asarray(csr @ compacta.T).T
+
+    # Bytes leídos y escritos por el producto: índices y datos de la matriz, población y coberturas
+    bytesAnterior = csr.indices.nbytes + csrAnterior.data.nbytes + anterior.nbytes + coberturaAnterior.nbytes
+    bytesCompacta = csr.indices.nbytes + csr.data.nbytes + compacta.nbytes + coberturaCompacta.nbytes
+
+    tiempoAnterior = cronometrar(lambda: csrAnterior @ anterior.T, repeticiones)
+    tiempoCompacta = cronometrar(lambda: csr @ compacta.T, repeticiones)
+
+    reparacionAnterior = cronometrar(lambda: instance.repair_batch(anterior.copy(), repairType), 1)
+    reparacionCompacta = cronometrar(lambda: instance.repair_batch(compacta.copy(), repairType), 1)
+
+    print(f"{nombre} ({instance.getRows()} x {instance.getColumns()}, nnz {csr.nnz}, {individuos} individuos)")
+    print(f"  Población (MB):    int64 {megabytes(anterior.nbytes):>8.2f} | uint8 {megabytes(compacta.nbytes):>8.2f} | "
+          f"empaquetada {megabytes(PackedPopulation.pack(compacta).nbytes()):>8.2f}")
+    print(f"  Coberturas (MB):   int64 {megabytes(coberturaAnterior.nbytes):>8.2f} | "
+          f"{coberturaCompacta.dtype} {megabytes(coberturaCompacta.nbytes):>8.2f}")
+    print(f"  Producto (ms):     {1000 * tiempoAnterior:>8.2f} -> {1000 * tiempoCompacta:>8.2f} | "
+          f"tráfico {megabytes(bytesAnterior):.1f} -> {megabytes(bytesCompacta):.1f} MB "
+          f"({megabytes(bytesAnterior) / 1024 / tiempoAnterior:.2f} -> {megabytes(bytesCompacta) / 1024 / tiempoCompacta:.2f} GB/s)")
+    print(f"  Reparación {repairType} (s): {reparacionAnterior:.3f} -> {reparacionCompacta:.3f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Memoria y ancho de banda del camino binario de SCP/USCP con tipos compactos")
+    parser.add_argument('instancias', nargs = '*', help = f"Instancias (por defecto: {' '.join(INSTANCIAS)})")
+    parser.add_argument('--pop', type = int, default = 100)
+    parser.add_argument('--repeticiones', type = int, default = 10)
+    parser.add_argument('--repair', default = 'complex')
+
+    args = parser.parse_args()
+
+    for nombre in args.instancias or INSTANCIAS:
+        comparar(nombre, args.pop, args.repeticiones, args.repair)
+        print("------------------------------------------------------------------------------------------------------")
@@ -0,0 +1,71 @@
+import time
+import random
+import argparse
+import numpy as np
+
+from Problem.SCP.problem import SCP
+from Problem.USCP.problem import USCP
+from Problem.packed import DTYPE_BINARIO
+
+# Compara la reparación simple actual con el recorrido secuencial original (filas en orden
+# aleatorio, producto denso por fila y argmin de costo) en instancias tipo clr, partiendo de
+# soluciones vacías y de soluciones dispersas. También compara la reparación de una población
+# completa (repair_batch) con reparar cada individuo por separado.
+
+INSTANCIAS = ['uscpclr13', 'uscpclr12', 'scpnrh1']
+DENSIDADES = [0.0, 0.01]
+
+def cargar(nombre):
+    return USCP(nombre) if nombre.startswith('uscp') else SCP(nombre)
+
+def repairSimpleOriginal(coverange, costs, solution):
+    # Reparación simple tal como estaba antes de vectorizarla
+    indices = list(range(coverange.shape[0]))
+    random.shuffle(indices)
+
+    for i in indices:
+        if np.sum(coverange[i] * solution) < 1:
+            idx = np.argwhere(coverange[i] > 0)
+            idxLowcost = idx[np.argmin(costs[idx])]
+            solution[idxLowcost[0]] = 1
+
+    return solution
+
+def cronometrar(funcion, soluciones):
+    inicio = time.perf_counter()
+
+    for solucion in soluciones:
+        funcion(solucion.copy())
+
+    return (time.perf_counter() - inicio) / len(soluciones)
+
+def comparar(nombre, repeticiones):
+    instance = cargar(nombre)
+    densa = instance.getCoverangeCSR().toarray()
+    costs = instance.getCost()
+
+    print(f"{nombre} ({instance.getRows()} x {instance.getColumns()})")
+
+    for densidad in DENSIDADES:
+        soluciones = (np.random.rand(repeticiones, instance.getColumns()) < densidad).astype(DTYPE_BINARIO)
+
+        original = cronometrar(lambda x: repairSimpleOriginal(densa, costs, x), soluciones)
+        actual = cronometrar(lambda x: instance.repair(x, 'simple'), soluciones)
+
+        inicio = time.perf_counter()
+        instance.repair_batch(soluciones.copy(), 'simple')
+        poblacion = (time.perf_counter() - inicio) / repeticiones
+
+        print(f"  densidad {densidad:.2f}: original {original:.4f} s | actual {actual:.4f} s | "
+              f"población {poblacion:.4f} s por reparación")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Tiempo de la reparación simple frente al recorrido secuencial original")
+    parser.add_argument('instancias', nargs = '*', help = f"Instancias (por defecto: {' '.join(INSTANCIAS)})")
+    parser.add_argument('--repeticiones', type = int, default = 10)
+
+    args = parser.parse_args()
+
+    for nombre in args.instancias or INSTANCIAS:
+        comparar(nombre, args.repeticiones)
+        print("------------------------------------------------------------------------------------------------------")
@@ -0,0 +1,74 @@
+import os
+import time
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Problem.cache import cargarInstancia
+from Problem.SCP.problem import leerInstancia
+from Problem.USCP.problem import leerInstanciaUSCP
+from Problem.KP.problem import read_instance_file
+
+# Parser de cada tipo de problema, según la carpeta Problem/<tipo>/Instances
+PARSERS = {
+    'SCP': leerInstancia,
+    'USCP': leerInstanciaUSCP,
+    'KP': read_instance_file
+}
+
+def listar_instancias(problemas):
+    tareas = []
+
+    for problema in problemas:
+        directorio = f'./Problem/{problema}/Instances/'
+
+        if not os.path.isdir(directorio):
+            continue
+
+        for archivo in sorted(os.listdir(directorio)):
+            tareas.append((problema, os.path.join(directorio, archivo)))
+
+    return tareas
+
+def compilar(problema, ruta, forzar):
+    inicio = time.time()
+    cargarInstancia(problema, ruta, PARSERS[problema], forzar = forzar)
+
+    return time.time() - inicio
+
+def compilar_instancias(problemas, procesos, forzar):
+    """Precompila la caché binaria de todas las instancias de los problemas indicados en paralelo."""
+    tareas = listar_instancias(problemas)
+    inicio = time.time()
+    errores = 0
+
+    with ProcessPoolExecutor(max_workers = procesos) as executor:
+        futuros = {executor.submit(compilar, problema, ruta, forzar): (problema, ruta) for problema, ruta in tareas}
+
+        for futuro in as_completed(futuros):
+            problema, ruta = futuros[futuro]
+
+            try:
+                print(f"{problema:<5} {os.path.basename(ruta):<25} {futuro.result():.3f} s")
+            except Exception as e:
+                errores += 1
+                print(f"{problema:<5} {os.path.basename(ruta):<25} Error: {e}")
+
+    print("------------------------------------------------------------------------------------------------------")
+    print(f"Instancias procesadas: {len(tareas)} - Errores: {errores} - Tiempo total (s): {time.time() - inicio:.2f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Precompila la caché binaria de las instancias en ./Cache/instancias/")
+    parser.add_argument('problemas', nargs = '*', help = f"Problemas a compilar (por defecto: {' '.join(PARSERS)})")
+    parser.add_argument('--procesos', type = int, default = os.cpu_count())
+    parser.add_argument('--forzar', action = 'store_true', help = "Recompila aunque la caché esté vigente")
+
+    args = parser.parse_args()
+
+    problemas = args.problemas or list(PARSERS.keys())
+
+    for problema in problemas:
+        if problema not in PARSERS:
+            parser.error(f"Problema '{problema}' no reconocido. Opciones: {', '.join(PARSERS)}")
+
+    compilar_instancias(problemas, args.procesos, args.forzar)
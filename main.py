@@ -28,7 +28,8 @@ def ejecutar_problema_scp_uscp(id, instancia, ds, parametros, solver_func, unico
     
     solver_func(
         id, parametros["mh"], int(parametros["iter"]),
-        int(parametros["pop"]), instancia, ds, repair, parMH, unicost
+        int(parametros["pop"]), instancia, ds, repair, parMH, unicost,
+        opciones=parametros
     )
 def ejecutar_kp(id, instancia_name, ds, parametros, solver_func):
         """Ejecuta problemas de tipo KP."""
@@ -42,7 +43,8 @@ def ejecutar_kp(id, instancia_name, ds, parametros, solver_func):
             int(parametros["pop"]),
             instancia_name, # Nombre del archivo de instancia, ej: "f1_l-d_kp_10_269"
             ds,
-            parMH_kp
+            parMH_kp,
+            opciones=parametros
         )
     
 def procesar_experimento(data, bd):
@@ -0,0 +1,40 @@
+import sys
+import numpy as np
+
+from Problem.KP.problem import KP
+from Problem.fitness_cache import FitnessCache
+from Problem.packed import DTYPE_BINARIO
+
+# Verifica que la caché de fitness sea transparente en KP: con y sin caché, evaluate (una
+# solución, siempre repara) y evaluate_batch (población, solo repara las infactibles) deben
+# dar cada uno las mismas soluciones reparadas y fitness, aunque compartan la caché.
+# Uso: python -m test.testCacheKP [instancia]
+
+instancia = sys.argv[1] if len(sys.argv) > 1 else 'kn_f1_l-d_kp_10_269'
+
+sinCache = KP(instancia)
+conCache = KP(instancia)
+conCache.setFitnessCache(FitnessCache(16))
+
+for densidad in [0.1, 0.5, 0.9]:
+    population = (np.random.rand(50, sinCache.getItems()) < densidad).astype(DTYPE_BINARIO)
+    # Individuos repetidos para que la segunda vuelta tome los resultados de la caché
+    population = np.vstack([population, population[:10]])
+
+    esperada, fitnessEsperado = sinCache.evaluate_batch(population.copy())
+
+    for _ in range(2):
+        reparada, fitness = conCache.evaluate_batch(population.copy())
+        assert np.array_equal(reparada, esperada) and np.allclose(fitness, fitnessEsperado)
+
+        # La población solo repara los individuos infactibles; los factibles quedan igual
+        factibles = population @ sinCache.getWeights() <= sinCache.getCapacity()
+        assert np.array_equal(esperada[factibles], population[factibles])
+
+        for j in range(len(population)):
+            solucion, valor = sinCache.evaluate(population[j].copy())
+            solucionCache, valorCache = conCache.evaluate(population[j].copy())
+
+            assert np.array_equal(solucionCache, solucion) and np.isclose(valorCache, valor)
+
+print(f"{instancia}: fitness idéntico con y sin caché ({conCache.getFitnessCache().getStats()})")